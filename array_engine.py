@@ -0,0 +1,499 @@
+"""Structure-of-arrays simulation engine
+
+ArrayEcosystem keeps every population as parallel NumPy arrays instead of
+Prey / Predator / Resource objects, and applies each phase of a tick as a
+batch of array operations. It follows the same rules as ecosystem.Simulation
+and exposes the same step() / sample() / is_active() interface, so it can be
+swapped in for headless runs with populations in the 10^5 - 10^6 range.
+
+Where the object engine resolves conflicts implicitly through its update
+order, the batched phases resolve them by agent index: when several prey
+reach the same food patch in one tick the lowest-indexed prey eats and the
+others count a failed eat. Predation follows the object engine's batched
+rule: when several predators catch the same prey the closest one gets it
+(lowest index on an exact tie).
+"""
+import numpy as np
+
+from config import Parameters
+from spatial import World
+from ecosystem import screen_width, screen_height
+
+# Learning level above which prey search wider, as in Prey.make_smart_move
+SMART_LEARNING_LEVEL = 0.3
+
+
+class CellIndex:
+    """Uniform grid over a set of points, stored as cell-sorted index arrays
+
+    Built once per phase from position arrays; nearest() answers a whole
+    batch of nearest-within-radius queries at once by expanding square rings
+    of cells around every query until no closer cell can exist.
+    """
+    def __init__(self, x, y, cell_size, width, height):
+        self.x = x
+        self.y = y
+        self.cell_size = cell_size
+        self.cells_x = int(width // cell_size) + 1
+        self.cells_y = int(height // cell_size) + 1
+        cell = self.cell_ids(*self.cell_coords(x, y))
+        # Stable sort keeps points in index order within a cell
+        self.order = np.argsort(cell, kind='stable')
+        self.counts = np.bincount(cell, minlength=self.cells_x * self.cells_y)
+        self.starts = np.cumsum(self.counts) - self.counts
+
+    def cell_coords(self, x, y):
+        cx = np.clip((x // self.cell_size).astype(np.int64), 0, self.cells_x - 1)
+        cy = np.clip((y // self.cell_size).astype(np.int64), 0, self.cells_y - 1)
+        return cx, cy
+
+    def cell_ids(self, cx, cy):
+        return cx * self.cells_y + cy
+
+    def nearest(self, qx, qy, radius, chunk_size=32768):
+        """Index and distance of the closest point strictly inside radius
+
+        Of points at the same distance the lowest index wins. radius may be a scalar or one value per query. Queries with no point
+        in range get index -1 and distance inf.
+        """
+        n = len(qx)
+        radius = np.broadcast_to(np.asarray(radius, dtype=np.float64), (n,))
+        best = np.full(n, -1, dtype=np.int64)
+        best_distance = np.array(radius, dtype=np.float64)
+        if n and len(self.x):
+            # Chunking bounds the size of the candidate-pair arrays
+            for start in range(0, n, chunk_size):
+                stop = min(n, start + chunk_size)
+                self._nearest_chunk(qx, qy, radius, best, best_distance, np.arange(start, stop))
+        best_distance[best < 0] = np.inf
+        return best, best_distance
+
+    def _nearest_chunk(self, qx, qy, radius, best, best_distance, active):
+        cell_size = self.cell_size
+        qcx, qcy = self.cell_coords(qx[active], qy[active])
+        max_ring = int(radius[active].max() // cell_size) + 1
+        for ring in range(max_ring + 1):
+            if ring > 0:
+                # Cells on this ring are at least (ring - 1) cells away; best_distance
+                # starts at the radius, so exhausted queries drop out here too. A ring
+                # exactly at the best distance is still scanned for lower-index ties
+                keep = (ring - 1) * cell_size <= best_distance[active]
+                active, qcx, qcy = active[keep], qcx[keep], qcy[keep]
+                if not active.size:
+                    break
+            offsets = ring_offsets(ring)
+            cx = qcx[:, None] + offsets[:, 0]
+            cy = qcy[:, None] + offsets[:, 1]
+            valid = (cx >= 0) & (cx < self.cells_x) & (cy >= 0) & (cy < self.cells_y)
+            query = np.broadcast_to(active[:, None], cx.shape)[valid]
+            cell = self.cell_ids(cx[valid], cy[valid])
+            counts = self.counts[cell]
+            total = int(counts.sum())
+            if not total:
+                continue
+
+            # Expand every (query, cell) pair into (query, point) candidate pairs
+            query = np.repeat(query, counts)
+            first = np.repeat(self.starts[cell], counts)
+            ramp = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            candidate = self.order[first + ramp]
+            distance = np.sqrt((qx[query] - self.x[candidate])**2 + (qy[query] - self.y[candidate])**2)
+
+            # Closer than the best so far, or as close with a lower point index
+            current = best[query]
+            closer = (distance < best_distance[query]) | ((distance == best_distance[query]) & (current >= 0)
+                                                          & (candidate < current))
+            query, candidate, distance = query[closer], candidate[closer], distance[closer]
+            if not query.size:
+                continue
+            # Closest candidate per query, ties going to the lowest point index
+            order = np.lexsort((candidate, distance, query))
+            query, candidate, distance = query[order], candidate[order], distance[order]
+            first_of_query = np.ones(len(query), dtype=bool)
+            first_of_query[1:] = query[1:] != query[:-1]
+            best[query[first_of_query]] = candidate[first_of_query]
+            best_distance[query[first_of_query]] = distance[first_of_query]
+
+
+_ring_offset_cache = {}
+
+def ring_offsets(ring):
+    """(k, 2) array of cell offsets on the square ring at Chebyshev distance ring"""
+    offsets = _ring_offset_cache.get(ring)
+    if offsets is None:
+        span = np.arange(-ring, ring + 1)
+        dx, dy = np.meshgrid(span, span, indexing='ij')
+        on_ring = np.maximum(np.abs(dx), np.abs(dy)) == ring
+        offsets = np.stack([dx[on_ring], dy[on_ring]], axis=1)
+        _ring_offset_cache[ring] = offsets
+    return offsets
+
+
+def first_claims(claimer, target):
+    """Mask over claimer keeping only the first (lowest index) claim on each target"""
+    _, first = np.unique(target, return_index=True)
+    winners = np.zeros(len(claimer), dtype=bool)
+    winners[first] = True
+    return winners
+
+
+def closest_claims(claimer, target, distance):
+    """Mask over claimer keeping only the closest claim on each target (lowest index on ties)"""
+    order = np.lexsort((claimer, distance, target))
+    _, first = np.unique(target[order], return_index=True)
+    winners = np.zeros(len(claimer), dtype=bool)
+    winners[order[first]] = True
+    return winners
+
+
+class ArrayRandomStreams:
+    """NumPy counterpart of ecosystem.RandomStreams: one Generator per kind of randomness"""
+    NAMES = ('movement', 'predation', 'regrowth', 'spawning')
+
+    def __init__(self, seed=None):
+        sequence = np.random.SeedSequence(seed)
+        self.seed = sequence.entropy
+        for name, child in zip(self.NAMES, sequence.spawn(len(self.NAMES))):
+            setattr(self, name, np.random.default_rng(child))
+
+
+class ArrayEcosystem:
+    """World state for one run stored as NumPy arrays, advanced with step()
+
+    With replicates > 1 the arrays hold that many independent copies of the
+    world at once (an ensemble): every agent carries a replicate id and each
+    replicate lives in its own strip of x, far enough apart that no search
+    radius reaches a neighbour. All replicates then share every batched
+    operation. sample() aggregates over all replicates; replicate_samples()
+    reports each one separately.
+    """
+    def __init__(self, initial_prey=50, initial_predators=10, initial_resources=150, max_resources=300,
+                 parameters=None, seed=None, width=screen_width, height=screen_height, cell_size=50,
+                 replicates=1):
+        self.random = ArrayRandomStreams(seed)
+        self.seed = self.random.seed
+        self.width = width
+        self.height = height
+        self.world = World(width, height)  # Bounded only
+        self.cell_size = cell_size
+        self.max_resources = max_resources
+        self.parameters = parameters or Parameters()
+        self.replicates = replicates
+        # Replicate r occupies x in [r * stride, r * stride + width], with a gap
+        # wider than the longest search (smart prey see up to twice their vision)
+        self.stride = width + self.parameters.search_reach + cell_size
+        self.tick_count = 0
+        # Tick each replicate's predators went extinct, -1 while predators exist
+        self.extinction_ticks = np.full(replicates, -1, dtype=np.int64)
+
+        # Prey
+        self.prey_replicate = np.repeat(np.arange(replicates), initial_prey)
+        self.prey_x, self.prey_y = self.spawn_positions(self.prey_replicate, 50)
+        count = len(self.prey_x)
+        self.prey_energy = np.full(count, self.parameters.prey_start_energy, dtype=np.float64)
+        self.prey_birth_tick = np.zeros(count, dtype=np.int64)
+        self.prey_has_reproduced = np.zeros(count, dtype=bool)
+        self.prey_successful_actions = np.zeros(count, dtype=np.int64)
+        self.prey_total_actions = np.zeros(count, dtype=np.int64)
+        self.prey_learning = np.zeros(count, dtype=np.float64)
+
+        # Predators
+        self.predator_replicate = np.empty(0, dtype=np.int64)
+        self.predator_x = np.empty(0)
+        self.predator_y = np.empty(0)
+        self.predator_energy = np.empty(0)
+        self.predator_prey_eaten = np.empty(0, dtype=np.int64)
+        self.spawn_predators(np.repeat(np.arange(replicates), initial_predators))
+
+        # Resources
+        self.resource_replicate = np.empty(0, dtype=np.int64)
+        self.resource_x = np.empty(0)
+        self.resource_y = np.empty(0)
+        self.resource_has_food = np.empty(0, dtype=bool)
+        self.resource_regrow_timer = np.empty(0, dtype=np.int64)
+        self.spawn_resources(np.repeat(np.arange(replicates), initial_resources))
+
+    @property
+    def prey_count(self):
+        return len(self.prey_x)
+
+    @property
+    def predator_count(self):
+        return len(self.predator_x)
+
+    @property
+    def predator_extinction_tick(self):
+        """Extinction tick of a single-replicate run (None while predators exist)"""
+        tick = int(self.extinction_ticks[0])
+        return None if tick < 0 else tick
+
+    def offsets(self, replicate):
+        return replicate * float(self.stride)
+
+    def spawn_positions(self, replicate, margin):
+        count = len(replicate)
+        x = self.random.spawning.integers(margin, self.width - margin + 1, count) + self.offsets(replicate)
+        y = self.random.spawning.integers(margin, self.height - margin + 1, count).astype(np.float64)
+        return x, y
+
+    def spawn_predators(self, replicate):
+        count = len(replicate)
+        x, y = self.spawn_positions(replicate, 50)
+        self.predator_replicate = np.concatenate([self.predator_replicate, replicate])
+        self.predator_x = np.concatenate([self.predator_x, x])
+        self.predator_y = np.concatenate([self.predator_y, y])
+        self.predator_energy = np.concatenate([self.predator_energy, np.full(count, self.parameters.predator_start_energy,
+                                                                             dtype=np.float64)])
+        self.predator_prey_eaten = np.concatenate([self.predator_prey_eaten, np.zeros(count, dtype=np.int64)])
+
+    def spawn_resources(self, replicate):
+        count = len(replicate)
+        x, y = self.spawn_positions(replicate, 20)
+        self.resource_replicate = np.concatenate([self.resource_replicate, replicate])
+        self.resource_x = np.concatenate([self.resource_x, x])
+        self.resource_y = np.concatenate([self.resource_y, y])
+        self.resource_has_food = np.concatenate([self.resource_has_food, np.ones(count, dtype=bool)])
+        self.resource_regrow_timer = np.concatenate([self.resource_regrow_timer, self.regrow_times(count)])
+
+    def is_active(self):
+        return self.prey_count > 0 or self.predator_count > 0
+
+    def configure(self, parameters=None, max_resources=None, **changes):
+        """Change the rules mid-run (e.g. for a checkpoint.fork branch), like Simulation.configure"""
+        if max_resources is not None:
+            self.max_resources = max_resources
+        if parameters is not None or changes:
+            parameters = (parameters or self.parameters).replace(**changes)
+            if self.width + parameters.search_reach + self.cell_size > self.stride:
+                raise ValueError("Vision can only grow up to the replicate spacing chosen at construction")
+            self.parameters = parameters
+
+    def reseed(self, seed):
+        """Continue with fresh random streams from seed"""
+        self.random = ArrayRandomStreams(seed)
+        self.seed = self.random.seed
+
+    def clamp(self, x, y, replicate):
+        offset = self.offsets(replicate)
+        np.clip(x, offset + 5, offset + self.width - 5, out=x)
+        np.clip(y, 5, self.height - 5, out=y)
+
+    def index(self, x, y):
+        """CellIndex over points of every replicate"""
+        return CellIndex(x, y, self.cell_size, self.replicates * self.stride, self.height)
+
+    def step(self):
+        """Advance the world by one tick"""
+        self.update_resources()
+        self.update_prey()
+        self.update_predators()
+
+        # If no predators for 300 ticks, spawn 3 new ones
+        extinct = np.bincount(self.predator_replicate, minlength=self.replicates) == 0
+        ticks = self.extinction_ticks
+        ticks[extinct & (ticks < 0)] = self.tick_count
+        respawn = np.flatnonzero(extinct & (self.tick_count - ticks >= 300))
+        if respawn.size:
+            self.spawn_predators(np.repeat(respawn, 3))
+        ticks[respawn] = -1
+        ticks[~extinct] = -1
+
+        # Add resources if needed - MORE FREQUENT RESOURCE SPAWNING
+        self.tick_count += 1
+        if self.tick_count % 25 == 0:
+            counts = np.bincount(self.resource_replicate, minlength=self.replicates)
+            grow = np.flatnonzero(counts < self.max_resources)
+            if grow.size:
+                self.spawn_resources(grow)
+
+    def update_resources(self):
+        """Resource.update for every depleted patch at once"""
+        depleted = ~self.resource_has_food
+        self.resource_regrow_timer[depleted] -= 1
+        regrown = depleted & (self.resource_regrow_timer <= 0)
+        count = int(regrown.sum())
+        if count:
+            self.resource_has_food[regrown] = True
+            self.resource_regrow_timer[regrown] = self.regrow_times(count)
+
+    def regrow_times(self, count):
+        parameters = self.parameters
+        return self.random.regrowth.integers(parameters.regrow_min, parameters.regrow_max + 1, count)
+
+    def update_prey(self):
+        """Prey.update, death and reproduction for the whole population"""
+        n = self.prey_count
+        if not n:
+            return
+        parameters = self.parameters
+        x, y, learning = self.prey_x, self.prey_y, self.prey_learning
+        self.prey_energy -= parameters.prey_metabolism
+
+        # Experienced prey search a wider radius; when that finds nothing the
+        # narrower fallback search cannot find anything either
+        smart = learning > SMART_LEARNING_LEVEL
+        radius = np.where(smart, parameters.prey_vision * (1 + learning), parameters.prey_vision)
+        food = np.flatnonzero(self.resource_has_food)
+        target, distance = self.index(self.resource_x[food], self.resource_y[food]).nearest(x, y, radius)
+
+        has_target = target >= 0
+        seeker = np.flatnonzero(has_target)
+        target = food[target[seeker]]
+        tx, ty = self.resource_x[target], self.resource_y[target]
+        self.move_towards(x, y, seeker, tx, ty, parameters.prey_speed)
+
+        # Smart prey check the distance after moving, the fallback branch before
+        reach = distance[seeker]
+        smart_seeker = smart[seeker]
+        reach[smart_seeker] = np.sqrt((x[seeker[smart_seeker]] - tx[smart_seeker])**2 +
+                                      (y[seeker[smart_seeker]] - ty[smart_seeker])**2)
+        in_reach = reach < parameters.eat_distance
+        eater, meal = seeker[in_reach], target[in_reach]
+        ate = first_claims(eater, meal)
+        self.resource_has_food[meal[ate]] = False
+        self.prey_energy[eater[ate]] = np.minimum(parameters.prey_max_energy,
+                                                  self.prey_energy[eater[ate]] + parameters.food_energy)
+
+        wanderer = np.flatnonzero(~has_target)
+        self.move_random(x, y, self.prey_replicate, wanderer)
+
+        # LEARNING: successful eats count for, failed eats and wandering against
+        learned = np.concatenate([eater, wanderer])
+        success = np.concatenate([ate, np.zeros(len(wanderer), dtype=bool)])
+        self.prey_total_actions[learned] += 1
+        self.prey_successful_actions[learned[success]] += 1
+        experienced = learned[self.prey_total_actions[learned] > 5]
+        learning[experienced] = np.minimum(1.0, self.prey_successful_actions[experienced] /
+                                           self.prey_total_actions[experienced])
+
+        # Survivors past the reproduction age give birth to a litter once
+        alive = self.prey_energy > 0
+        parents = np.flatnonzero(alive & ~self.prey_has_reproduced &
+                                 (self.tick_count - self.prey_birth_tick > parameters.reproduction_age))
+        self.prey_has_reproduced[parents] = True
+        parents = np.repeat(parents, parameters.litter_size)
+        child_replicate = self.prey_replicate[parents]
+        spread = parameters.birth_spread
+        child_x = x[parents] + self.random.spawning.integers(-spread, spread + 1, len(parents))
+        child_y = y[parents] + self.random.spawning.integers(-spread, spread + 1, len(parents))
+        self.clamp(child_x, child_y, child_replicate)
+
+        self.keep_prey(alive)
+        self.add_prey(child_x, child_y, child_replicate)
+
+    def keep_prey(self, mask):
+        self.prey_replicate = self.prey_replicate[mask]
+        self.prey_x = self.prey_x[mask]
+        self.prey_y = self.prey_y[mask]
+        self.prey_energy = self.prey_energy[mask]
+        self.prey_birth_tick = self.prey_birth_tick[mask]
+        self.prey_has_reproduced = self.prey_has_reproduced[mask]
+        self.prey_successful_actions = self.prey_successful_actions[mask]
+        self.prey_total_actions = self.prey_total_actions[mask]
+        self.prey_learning = self.prey_learning[mask]
+
+    def add_prey(self, x, y, replicate):
+        count = len(x)
+        if not count:
+            return
+        self.prey_replicate = np.concatenate([self.prey_replicate, replicate])
+        self.prey_x = np.concatenate([self.prey_x, x])
+        self.prey_y = np.concatenate([self.prey_y, y])
+        self.prey_energy = np.concatenate([self.prey_energy, np.full(count, self.parameters.prey_start_energy,
+                                                                     dtype=np.float64)])
+        self.prey_birth_tick = np.concatenate([self.prey_birth_tick, np.full(count, self.tick_count, dtype=np.int64)])
+        self.prey_has_reproduced = np.concatenate([self.prey_has_reproduced, np.zeros(count, dtype=bool)])
+        self.prey_successful_actions = np.concatenate([self.prey_successful_actions, np.zeros(count, dtype=np.int64)])
+        self.prey_total_actions = np.concatenate([self.prey_total_actions, np.zeros(count, dtype=np.int64)])
+        self.prey_learning = np.concatenate([self.prey_learning, np.zeros(count, dtype=np.float64)])
+
+    def update_predators(self):
+        """Predator.update and death for the whole population"""
+        n = self.predator_count
+        if not n:
+            return
+        parameters = self.parameters
+        x, y = self.predator_x, self.predator_y
+        self.predator_energy -= parameters.predator_metabolism
+
+        target, distance = self.index(self.prey_x, self.prey_y).nearest(x, y, parameters.predator_vision)
+
+        has_target = target >= 0
+        hunter = np.flatnonzero(has_target)
+        target, distance = target[hunter], distance[hunter]
+        self.move_towards(x, y, hunter, self.prey_x[target], self.prey_y[target], parameters.predator_speed)
+        self.move_random(x, y, self.predator_replicate, np.flatnonzero(~has_target))
+
+        # Roll the hunt for every predator in range, the closest success on a prey wins it
+        in_range = distance < parameters.hunt_distance
+        hunter, target, distance = hunter[in_range], target[in_range], distance[in_range]
+        caught = self.random.predation.random(len(hunter)) < parameters.hunt_probability
+        hunter, target, distance = hunter[caught], target[caught], distance[caught]
+        fed = closest_claims(hunter, target, distance)
+        hunter, target = hunter[fed], target[fed]
+        self.predator_prey_eaten[hunter] += 1
+        self.predator_energy[hunter] = np.minimum(parameters.predator_max_energy,
+                                                  self.predator_energy[hunter] + parameters.kill_energy)
+
+        survivors = np.ones(self.prey_count, dtype=bool)
+        survivors[target] = False
+        self.keep_prey(survivors)
+
+        alive = self.predator_energy > 0
+        self.predator_replicate = self.predator_replicate[alive]
+        self.predator_x = x[alive]
+        self.predator_y = y[alive]
+        self.predator_energy = self.predator_energy[alive]
+        self.predator_prey_eaten = self.predator_prey_eaten[alive]
+
+    def move_random(self, x, y, replicate, mover):
+        """Random step for agents[mover], clamped to their world like move_random"""
+        offset = self.offsets(replicate[mover])
+        x[mover] = np.clip(x[mover] + self.random.movement.integers(-4, 5, len(mover)),
+                           offset + 5, offset + self.width - 5)
+        y[mover] = np.clip(y[mover] + self.random.movement.integers(-4, 5, len(mover)), 5, self.height - 5)
+
+    @staticmethod
+    def move_towards(x, y, mover, tx, ty, speed):
+        """Move agents[mover] one step of speed towards (tx, ty), like move_towards_food"""
+        dx = tx - x[mover]
+        dy = ty - y[mover]
+        dist = np.maximum(1, np.sqrt(dx*dx + dy*dy))
+        x[mover] += (dx / dist) * speed
+        y[mover] += (dy / dist) * speed
+
+    def predators_respawning(self):
+        """Per replicate: 1 when predators are due to respawn, as in Simulation.sample"""
+        ticks = self.extinction_ticks
+        return ((ticks > 0) & (self.tick_count - ticks >= 300)).astype(np.int64)
+
+    def sample(self, parameters_changed):
+        """Collect one row of run data for the current tick, like Simulation.sample"""
+        avg_learning = float(self.prey_learning.mean()) if self.prey_count else 0
+        return {
+            'tick': self.tick_count,
+            'prey_count': self.prey_count,
+            'predator_count': self.predator_count,
+            'resource_count': int(self.resource_has_food.sum()),
+            'avg_learning': round(avg_learning, 3),
+            'total_prey_eaten': int(self.predator_prey_eaten.sum()),
+            'predators_respawned': int(self.predators_respawning().sum()),
+            'parameters_changed': parameters_changed
+        }
+
+    def replicate_samples(self):
+        """The sample() metrics as one array per metric, indexed by replicate"""
+        replicates = self.replicates
+        prey_count = np.bincount(self.prey_replicate, minlength=replicates)
+        learning_total = np.bincount(self.prey_replicate, weights=self.prey_learning, minlength=replicates)
+        return {
+            'tick': self.tick_count,
+            'prey_count': prey_count,
+            'predator_count': np.bincount(self.predator_replicate, minlength=replicates),
+            'resource_count': np.bincount(self.resource_replicate, weights=self.resource_has_food,
+                                          minlength=replicates).astype(np.int64),
+            'avg_learning': np.divide(learning_total, prey_count, out=np.zeros(replicates), where=prey_count > 0),
+            'total_prey_eaten': np.bincount(self.predator_replicate, weights=self.predator_prey_eaten,
+                                            minlength=replicates).astype(np.int64),
+            'predators_respawned': self.predators_respawning(),
+        }
@@ -0,0 +1,61 @@
+"""Tick cost of the object engine vs the NumPy array engine as populations grow
+
+Populations keep the baseline ratios (50 prey : 10 predators : 400
+resources) and the world grows so the density matches the 800x600 baseline.
+The object engine is skipped above --object-limit prey.
+
+    python benchmarks/array_engine_scaling.py --sizes 1000 10000 100000 1000000
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import ecosystem
+from array_engine import ArrayEcosystem
+
+
+def time_ticks(sim, ticks):
+    start = time.perf_counter()
+    for _ in range(ticks):
+        sim.step()
+    return (time.perf_counter() - start) / ticks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="*", default=[1000, 10000, 100000, 1000000],
+                        help="initial prey counts")
+    parser.add_argument("--ticks", type=int, default=10)
+    parser.add_argument("--object-limit", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    
+    print(f"{'prey':>8} {'predators':>9} {'resources':>9} {'world':>13} {'engine':>7} "
+          f"{'ms/tick':>9} {'agent updates/s':>16}")
+    for prey in args.sizes:
+        predators = prey // 5
+        resources = prey * 8
+        scale = math.sqrt(prey / 50)
+        width = int(ecosystem.screen_width * scale)
+        height = int(ecosystem.screen_height * scale)
+        agents = prey + predators + resources
+        
+        engines = [("array", lambda: ArrayEcosystem(prey, predators, resources, resources,
+                                                     seed=args.seed, width=width, height=height))]
+        if prey <= args.object_limit:
+            engines.append(("object", lambda: ecosystem.Simulation(prey, predators, resources, resources,
+                                                                   seed=args.seed, verbose=False,
+                                                                   width=width, height=height)))
+        
+        for name, make in engines:
+            per_tick = time_ticks(make(), args.ticks)
+            print(f"{prey:>8} {predators:>9} {resources:>9} {f'{width}x{height}':>13} {name:>7} "
+                  f"{per_tick * 1e3:>9.1f} {agents / per_tick:>16,.0f}")
+
+
+if __name__ == "__main__":
+    main()
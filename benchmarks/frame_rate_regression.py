@@ -0,0 +1,72 @@
+"""Check that population trajectories do not depend on the frame rate
+
+Runs the same seeded scenario headless (uncapped), rendered at a few
+frame rates and rendered with several ticks per frame, then compares the
+50-tick samples. Any difference means some
+rule is still tied to wall-clock time instead of the tick counter.
+
+    python benchmarks/frame_rate_regression.py --ticks 600
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import ecosystem
+import rendering
+
+
+def trajectory(seed, ticks, fps, headless, speed=1):
+    """Run one seeded simulation and return its samples and wall time"""
+    sim = ecosystem.Simulation(50, 10, 400, 600, seed=seed, verbose=False)
+    renderer = None
+    if not headless:
+        renderer = rendering.PygameRenderer(fps, speed)
+        renderer.start(0, "Frame rate regression", "", ticks)
+    
+    start = time.perf_counter()
+    samples = ecosystem.run_loop(sim, ticks, "", renderer)
+    return samples, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--fps", type=int, nargs="*", default=[30, 120],
+                        help="frame rates for the rendered runs")
+    parser.add_argument("--speed", type=int, nargs="*", default=[10],
+                        help="ticks per frame for extra rendered runs at the first frame rate")
+    args = parser.parse_args()
+    
+    # Rendered runs work without a real display
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    
+    modes = [("headless", None, True, 1)] + [(f"{fps} FPS", fps, False, 1) for fps in args.fps]
+    modes += [(f"{args.fps[0]} FPS x{speed}", args.fps[0], False, speed) for speed in args.speed]
+    reference = None
+    failed = False
+    for name, fps, headless, speed in modes:
+        samples, elapsed = trajectory(args.seed, args.ticks, fps, headless, speed)
+        ticks = samples[-1]['tick'] if samples else 0
+        rate = ticks / elapsed if elapsed else float('inf')
+        if reference is None:
+            reference = samples
+            status = "reference"
+        elif samples == reference:
+            status = "identical"
+        else:
+            status = "DIFFERENT"
+            failed = True
+        print(f"{name:>14}: {elapsed:7.2f} s  {rate:8.0f} ticks/s  {status}")
+    
+    if failed:
+        print("Trajectories depend on the frame rate")
+        sys.exit(1)
+    print("Trajectories match across frame rates")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Measure tick cost under heavy predation with the "Many Predators" scenario scaled up
+
+First times the removal pattern on its own: one phase over n agents in
+which a fraction of them die, done the old way (iterate a copy, list.remove
+each death) and with Population (kill in place, one commit). Then runs
+"Many Predators" (50 prey, 40 predators, 400/600 resources) with every
+count multiplied by each scale and reports the full tick cost together with
+the kills and deaths per tick it had to absorb.
+
+    python benchmarks/heavy_predation.py --scales 1 10 40 --ticks 300
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import ecosystem
+from population import Population
+
+
+class Agent:
+    pass
+
+
+def list_phase(agents, dead):
+    for agent in agents[:]:
+        if agent in dead:
+            agents.remove(agent)
+
+
+def population_phase(population, dead):
+    for agent in population:
+        if agent in dead:
+            population.kill(agent)
+    population.commit()
+
+
+def time_removals(n, fraction, rng):
+    agents = [Agent() for _ in range(n)]
+    dead = set(rng.sample(agents, int(n * fraction)))
+
+    start = time.perf_counter()
+    list_phase(list(agents), dead)
+    list_time = time.perf_counter() - start
+
+    population = Population(agents)
+    start = time.perf_counter()
+    population_phase(population, dead)
+    population_time = time.perf_counter() - start
+    return list_time, population_time
+
+
+def time_ticks(scale, ticks, seed):
+    sim = ecosystem.Simulation(50 * scale, 40 * scale, 400 * scale, 600 * scale, seed=seed, verbose=False)
+    stats = sim.stats
+    start = time.perf_counter()
+    while sim.tick_count < ticks and sim.is_active():
+        sim.step()
+    elapsed = time.perf_counter() - start
+    return sim, elapsed, stats.prey_killed, stats.prey_deaths + stats.predator_deaths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="*", default=[1000, 10000, 50000],
+                        help="agents in the removal microbenchmark")
+    parser.add_argument("--fraction", type=float, default=0.3, help="share of agents dying in one phase")
+    parser.add_argument("--scales", type=int, nargs="*", default=[1, 10, 40])
+    parser.add_argument("--ticks", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    print(f"One phase with {args.fraction:.0%} of the agents dying")
+    print(f"{'agents':>8} {'list ms':>9} {'population ms':>14} {'speedup':>8}")
+    for n in args.sizes:
+        list_time, population_time = time_removals(n, args.fraction, rng)
+        print(f"{n:>8} {list_time * 1e3:>9.1f} {population_time * 1e3:>14.1f} "
+              f"{list_time / population_time:>7.0f}x")
+
+    print(f"\nMany Predators scaled up, {args.ticks} ticks")
+    print(f"{'scale':>6} {'prey':>7} {'predators':>10} {'ms/tick':>8} {'kills/tick':>11} {'deaths/tick':>12}")
+    for scale in args.scales:
+        sim, elapsed, kills, deaths = time_ticks(scale, args.ticks, args.seed)
+        ticks = max(sim.tick_count, 1)
+        print(f"{scale:>6} {50 * scale:>7} {40 * scale:>10} {elapsed / ticks * 1e3:>8.2f} "
+              f"{kills / ticks:>11.1f} {deaths / ticks:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
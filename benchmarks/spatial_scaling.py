@@ -0,0 +1,84 @@
+"""Compare nearest-food lookups through SpatialGrid against a linear scan
+
+Food density is held at the baseline (400 resources on 800x600) while the
+population grows from hundreds to 100k agents, so the grid's per-query cost
+should stay flat and the linear scan's should grow with n. Linear-scan
+costs for a full tick are extrapolated from a sample of queries.
+
+    python benchmarks/spatial_scaling.py --sizes 100 1000 10000 100000
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from spatial import SpatialGrid
+
+BASELINE_DENSITY = 400 / (800 * 600)
+VISION = 150
+
+
+class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+def linear_nearest(items, x, y, radius):
+    closest = None
+    closest_distance = radius
+    for item in items:
+        distance = math.sqrt((x - item.x)**2 + (y - item.y)**2)
+        if distance < closest_distance:
+            closest_distance = distance
+            closest = item
+    return closest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="*", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--linear-queries", type=int, default=200,
+                        help="queries sampled for the linear scan")
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    
+    print(f"{'agents':>8} {'build ms':>9} {'grid us/q':>10} {'scan us/q':>10} "
+          f"{'grid ms/tick':>13} {'scan ms/tick':>13} {'speedup':>8}")
+    for n in args.sizes:
+        side = math.sqrt(n / BASELINE_DENSITY)
+        food = [Point(rng.uniform(0, side), rng.uniform(0, side)) for _ in range(n)]
+        queries = [(rng.uniform(0, side), rng.uniform(0, side)) for _ in range(n)]
+        
+        start = time.perf_counter()
+        grid = SpatialGrid(cell_size=VISION)
+        for item in food:
+            grid.insert(item)
+        build = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        for x, y in queries:
+            grid.nearest(x, y, VISION)
+        grid_per_query = (time.perf_counter() - start) / n
+        
+        sample = queries[:args.linear_queries]
+        start = time.perf_counter()
+        for x, y in sample:
+            expected = linear_nearest(food, x, y, VISION)
+            if grid.nearest(x, y, VISION)[0] is not expected:
+                sys.exit(f"Grid and linear scan disagree at n={n}")
+        # Subtract the grid lookups done for the correctness check
+        scan_per_query = (time.perf_counter() - start) / len(sample) - grid_per_query
+        
+        print(f"{n:>8} {build * 1e3:>9.1f} {grid_per_query * 1e6:>10.1f} {scan_per_query * 1e6:>10.1f} "
+              f"{(build + grid_per_query * n) * 1e3:>13.1f} {scan_per_query * n * 1e3:>13.1f} "
+              f"{scan_per_query / grid_per_query:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Check that the incremental population statistics match a rescan of the populations
+
+Runs seeded scenarios tick by tick and after every tick compares
+Simulation.stats with values recomputed from sim.preys, sim.predators and
+sim.resources: counts and food exactly, energy and learning means within a
+tight tolerance, and the avg_learning written to every 50-tick sample
+exactly (the rounded value a CSV would hold, including its sign).
+
+    python benchmarks/stats_consistency.py --seeds 0 1 2 --ticks 1000
+"""
+import argparse
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import ecosystem
+
+EXACT = {'prey_count', 'predator_count', 'resource_count', 'food_count', 'total_prey_eaten'}
+
+
+def rescan(sim):
+    """The statistics the tick loop tracks, recomputed from scratch"""
+    preys, predators = list(sim.preys), list(sim.predators)
+    return {
+        'prey_count': len(preys),
+        'predator_count': len(predators),
+        'resource_count': len(sim.resources),
+        'food_count': sum(1 for resource in sim.resources if resource.has_food),
+        'total_prey_eaten': sum(predator.prey_eaten for predator in predators),
+        'avg_learning': sum(prey.learning_level for prey in preys) / len(preys) if preys else 0,
+        'prey_energy_mean': sum(prey.energy for prey in preys) / len(preys) if preys else 0.0,
+        'predator_energy_mean': sum(predator.energy for predator in predators) / len(predators) if predators else 0.0,
+    }
+
+
+def compare(sim, tolerance):
+    """One message per statistic that disagrees with the rescan"""
+    stats = sim.stats.summary()
+    expected = rescan(sim)
+    wrong = []
+    for name, value in expected.items():
+        if name in EXACT:
+            same = stats[name] == value
+        else:
+            same = math.isclose(stats[name], value, rel_tol=tolerance, abs_tol=tolerance)
+        if not same:
+            wrong.append(f"{name} {stats[name]!r} != {value!r}")
+    return wrong
+
+
+def check_run(scenario, seed, ticks, tolerance):
+    """Step one run, returning (ticks checked, list of mismatch messages)"""
+    sim = ecosystem.Simulation(*scenario.counts, scenario.parameters, seed=seed, verbose=False)
+    problems = []
+    while sim.tick_count < ticks and sim.is_active():
+        sim.step()
+        problems += [f"tick {sim.tick_count}: {message}" for message in compare(sim, tolerance)]
+        if sim.tick_count % 50 == 0:
+            expected = round(rescan(sim)['avg_learning'], 3)
+            written = sim.sample("")['avg_learning']
+            # repr tells 0.0 from -0.0, which the CSV does too
+            if repr(written) != repr(expected):
+                problems.append(f"tick {sim.tick_count}: sampled avg_learning {written!r} != {expected!r}")
+    return sim.tick_count, problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seeds", type=int, nargs="*", default=[0, 1, 2], help="base seeds")
+    parser.add_argument("--runs", type=int, nargs="*", help="scenario run numbers (default: all)")
+    parser.add_argument("--ticks", type=int, default=1000)
+    parser.add_argument("--tolerance", type=float, default=1e-9,
+                        help="relative / absolute tolerance for the running means")
+    args = parser.parse_args()
+
+    failed = False
+    for seed in args.seeds:
+        for scenario in ecosystem.SCENARIOS:
+            if args.runs and scenario.run_number not in args.runs:
+                continue
+            ticks, problems = check_run(scenario, ecosystem.run_seed(seed, scenario.run_number),
+                                        args.ticks, args.tolerance)
+            status = "consistent" if not problems else f"{len(problems)} MISMATCHES"
+            print(f"seed {seed} run {scenario.run_number:02d} ({scenario.description}): {ticks} ticks, {status}")
+            for message in problems[:5]:
+                print(f"    {message}")
+            failed = failed or bool(problems)
+    if failed:
+        print("Statistics drifted from the populations")
+        sys.exit(1)
+    print("Statistics match a rescan of the populations")
+
+
+if __name__ == "__main__":
+    main()
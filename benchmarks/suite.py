@@ -0,0 +1,171 @@
+"""Benchmark the scenarios across population scales and engines, keeping a JSON history
+
+Runs every scenario of run_all_simulations headless with fixed seeds at
+each scale (1x, 10x, 100x the scenario's prey, predators and resources, with
+the world area scaled by the same factor so densities stay put) on each
+engine. Every case runs in a fresh process so its peak memory is its own.
+Reported per case: ticks/s, agent updates/s (prey + predators + resources
+updated, summed over ticks), peak resident memory and time to completion
+(max ticks or extinction). A case that exceeds --time-limit stops early
+and is marked partial; its rates are still valid.
+
+Each invocation appends an entry to the history file and compares the rates
+with the previous entry that used the same settings, flagging cases that
+got slower by more than --threshold.
+
+    python benchmarks/suite.py --scales 1 10 100 --engines object array
+    python benchmarks/suite.py --runs 1 4 --scales 1 10 --label my-change
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+import ecosystem
+
+
+def agent_count(sim):
+    """Agents the engine updates in one tick"""
+    if hasattr(sim, 'resource_x'):
+        return sim.prey_count + sim.predator_count + len(sim.resource_x)
+    return len(sim.preys) + len(sim.predators) + len(sim.resources)
+
+
+def run_case(case):
+    """Run one (scenario, engine, scale) case; meant to run in its own process"""
+    scale = case['scale']
+    scenario = case['scenario']
+    prey, predators, resources, max_resources = (count * scale for count in scenario.counts)
+    width = int(ecosystem.screen_width * math.sqrt(scale))
+    height = int(ecosystem.screen_height * math.sqrt(scale))
+    if case['engine'] == "array":
+        from array_engine import ArrayEcosystem
+        sim = ArrayEcosystem(prey, predators, resources, max_resources, scenario.parameters, seed=case['seed'],
+                             width=width, height=height)
+    else:
+        sim = ecosystem.Simulation(prey, predators, resources, max_resources, scenario.parameters,
+                                   seed=case['seed'], verbose=False, width=width, height=height)
+
+    agent_updates = 0
+    completed = True
+    start = time.perf_counter()
+    while sim.tick_count < case['max_ticks'] and sim.is_active():
+        agent_updates += agent_count(sim)
+        sim.step()
+        if time.perf_counter() - start > case['time_limit']:
+            completed = sim.tick_count >= case['max_ticks'] or not sim.is_active()
+            break
+    elapsed = time.perf_counter() - start
+
+    return dict(case,
+                scenario=scenario.to_dict(),  # JSON-friendly for the history file
+                ticks=sim.tick_count,
+                completed=completed,
+                elapsed=round(elapsed, 4),
+                ticks_per_s=round(sim.tick_count / elapsed, 2) if elapsed else None,
+                agent_updates_per_s=round(agent_updates / elapsed) if elapsed else None,
+                peak_memory_mb=round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1))
+
+
+def case_key(result):
+    return (result['run_number'], result['engine'], result['scale'])
+
+
+def version_label():
+    """Short git commit of the tree being benchmarked, if there is one"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as file:
+        return json.load(file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, nargs="*", help="scenario run numbers (default: all)")
+    parser.add_argument("--scales", type=int, nargs="*", default=[1, 10, 100])
+    parser.add_argument("--engines", nargs="*", choices=["object", "array"], default=["object", "array"])
+    parser.add_argument("--max-ticks", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0, help="base seed for the scenario seeds")
+    parser.add_argument("--time-limit", type=float, default=60.0, help="seconds before a case stops early")
+    parser.add_argument("--history", default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                          "history.json"))
+    parser.add_argument("--label", default=None, help="name for this entry (default: git commit)")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="slowdown against the previous entry reported as a regression")
+    args = parser.parse_args()
+
+    settings = {'max_ticks': args.max_ticks, 'seed': args.seed, 'time_limit': args.time_limit}
+    cases = []
+    for scenario in ecosystem.SCENARIOS:
+        if args.runs and scenario.run_number not in args.runs:
+            continue
+        for scale in args.scales:
+            for engine in args.engines:
+                cases.append(dict(settings, run_number=scenario.run_number, description=scenario.description,
+                                  scenario=scenario, scale=scale, engine=engine,
+                                  seed=ecosystem.run_seed(args.seed, scenario.run_number)))
+
+    history = load_history(args.history)
+    previous = next((entry for entry in reversed(history) if entry['settings'] == settings), None)
+    baseline = {case_key(result): result for result in previous['results']} if previous else {}
+
+    print(f"{'run':>3} {'scenario':<20} {'engine':>6} {'scale':>5} {'ticks':>5} {'time s':>8} "
+          f"{'ticks/s':>9} {'updates/s':>12} {'peak MB':>8}  vs previous")
+    results = []
+    regressions = []
+    # A fresh interpreter per case, so peak memory is not inherited from earlier cases
+    context = multiprocessing.get_context("spawn")
+    for case in cases:
+        with context.Pool(1) as pool:
+            result = pool.apply(run_case, (case,))
+        results.append(result)
+
+        change = ""
+        before = baseline.get(case_key(result))
+        if before and before['ticks_per_s'] and result['ticks_per_s']:
+            ratio = result['ticks_per_s'] / before['ticks_per_s'] - 1
+            change = f"{ratio:+.1%}"
+            if ratio < -args.threshold:
+                change += " REGRESSION"
+                regressions.append(result)
+        partial = "" if result['completed'] else " (partial)"
+        print(f"{result['run_number']:>3} {result['description']:<20} {result['engine']:>6} {result['scale']:>4}x "
+              f"{result['ticks']:>5} {result['elapsed']:>8.2f} {result['ticks_per_s']:>9.1f} "
+              f"{result['agent_updates_per_s']:>12,} {result['peak_memory_mb']:>8.1f}  {change}{partial}")
+
+    history.append({
+        'label': args.label or version_label(),
+        'date': datetime.now().isoformat(timespec="seconds"),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'settings': settings,
+        'results': results,
+    })
+    with open(args.history, 'w') as file:
+        json.dump(history, file, indent=1)
+    print(f"History saved to {args.history} ({len(history)} entries)")
+    if previous:
+        print(f"Compared with {previous['label']} ({previous['date']}): {len(regressions)} regressions")
+
+
+if __name__ == "__main__":
+    main()
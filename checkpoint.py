@@ -0,0 +1,154 @@
+"""Checkpoint, resume and fork full simulation state
+
+A checkpoint is the complete engine object (agents, spatial indexes,
+running stats, RNG stream states, tick_count and predator_extinction_tick)
+pickled and zlib-compressed, with the run metadata needed to resume it.
+Both Simulation and ArrayEcosystem can be checkpointed. A run resumed from
+a checkpoint continues exactly as the uninterrupted run would have.
+
+fork() copies a state into a new branch with different settings and/or a
+new seed, so one shared warm-up can feed many scenario branches without
+re-simulating the common prefix.
+
+    python ecosystem.py --headless --seed 7 --checkpoint-every 100
+    python ecosystem.py --headless --resume checkpoints/run_004_tick_000500.ckpt
+    python checkpoint.py --warmup 300 --seed 7    # fork one warm-up into the variants
+"""
+import argparse
+import os
+import pickle
+import zlib
+
+CHECKPOINT_FORMAT = 6
+
+
+def dumps(sim, metadata=None):
+    payload = {'format': CHECKPOINT_FORMAT, 'metadata': metadata or {}, 'sim': sim}
+    return zlib.compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def loads(data):
+    payload = pickle.loads(zlib.decompress(data))
+    if payload.get('format') != CHECKPOINT_FORMAT:
+        raise ValueError(f"Unsupported checkpoint format: {payload.get('format')}")
+    return payload['sim'], payload['metadata']
+
+
+def save_checkpoint(sim, path, metadata=None):
+    """Write sim to path atomically (a crash mid-write keeps the previous file)"""
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as file:
+        file.write(dumps(sim, metadata))
+    os.replace(temporary, path)
+
+
+def load_checkpoint(path):
+    """Returns (sim, metadata) from a checkpoint file"""
+    with open(path, 'rb') as file:
+        return loads(file.read())
+
+
+def fork(sim, seed=None, **settings):
+    """Independent copy of sim continuing with new rules and/or a new seed
+
+    settings go to the engine's configure(): a whole config.Parameters as
+    parameters=..., single rules such as prey_metabolism=2.0, or
+    max_resources. Without a new seed the branch repeats the parent's
+    random draws.
+    """
+    branch = pickle.loads(pickle.dumps(sim, protocol=pickle.HIGHEST_PROTOCOL))
+    if settings:
+        branch.configure(**settings)
+    if seed is not None:
+        branch.reseed(seed)
+    return branch
+
+
+class Checkpointer:
+    """run_loop observer that saves a checkpoint every `every` ticks
+
+    Files are named <directory>/run_NNN_tick_TTTTTT.ckpt; with keep set,
+    only the newest keep checkpoints of the run are left on disk. Given the
+    run's metrics sink, every save first syncs it to disk and stores where
+    it stands as metadata['sink'], so a resumed run reopens the same file or
+    dataset at that point (metrics.reopen_sink).
+    """
+    def __init__(self, directory, every, run_number=0, metadata=None, keep=None, sink=None):
+        self.directory = directory
+        self.every = every
+        self.run_number = run_number
+        self.metadata = dict(metadata or {}, run_number=run_number)
+        self.keep = keep
+        self.sink = sink
+        self.saved = []
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, tick):
+        return os.path.join(self.directory, f"run_{self.run_number:03d}_tick_{tick:06d}.ckpt")
+
+    def after_tick(self, sim):
+        """Save on every `every`-th tick; returns the checkpoint path or None"""
+        if sim.tick_count % self.every == 0:
+            return self.save(sim)
+        return None
+
+    def save(self, sim):
+        path = self.path_for(sim.tick_count)
+        metadata = self.metadata
+        if self.sink is not None:
+            metadata = dict(metadata, sink=self.sink.sync())
+        save_checkpoint(sim, path, metadata)
+        self.saved.append(path)
+        if self.keep is not None:
+            while len(self.saved) > self.keep:
+                os.remove(self.saved.pop(0))
+        return path
+
+
+def run_branches(warmup_ticks=300, max_ticks=1000, base_seed=0, output="branches.csv",
+                 warmup_path="warmup.ckpt"):
+    """Warm up the Baseline scenario once, then fork it into every scenario variant
+
+    The warm-up samples are written as run 0, each branch under its
+    scenario's run number and description, all to one CSV. Every branch
+    continues with its own seed so the branches diverge after the fork.
+    """
+    import ecosystem
+    from metrics import CSVSink, RUN_CSV_COLUMNS
+
+    baseline = ecosystem.SCENARIOS[0]
+    sim = ecosystem.Simulation(*baseline.counts, baseline.parameters, seed=base_seed, verbose=False)
+    parameters_changed = baseline.parameters_changed()
+    # Scenarios that start like the baseline and only change the rules
+    branches = [scenario for scenario in ecosystem.SCENARIOS if scenario.counts == baseline.counts]
+
+    with CSVSink(output, metadata_columns=RUN_CSV_COLUMNS + [('Seed', 'seed')]) as sink:
+        sink.start_run({'run_number': 0, 'description': f"Warm-up ({baseline.description})", 'seed': sim.seed,
+                        'parameters_changed': parameters_changed})
+        ecosystem.run_loop(sim, warmup_ticks, parameters_changed, sink=sink)
+        save_checkpoint(sim, warmup_path, {'run_number': 0, 'description': baseline.description,
+                                           'counts': baseline.counts, 'max_ticks': max_ticks,
+                                           'parameters': baseline.parameters})
+        print(f"Warm-up saved to {warmup_path} at tick {sim.tick_count}")
+
+        for scenario in branches:
+            run_number = scenario.run_number
+            branch = fork(sim, seed=ecosystem.run_seed(base_seed, run_number), parameters=scenario.parameters)
+            branch_parameters = scenario.parameters_changed()
+            sink.start_run({'run_number': run_number, 'description': scenario.description, 'seed': branch.seed,
+                            'parameters_changed': branch_parameters})
+            ecosystem.run_loop(branch, max_ticks, branch_parameters, sink=sink)
+            print(f"Branch {run_number:02d} ({scenario.description}): {len(branch.preys)} prey, "
+                  f"{len(branch.predators)} predators at tick {branch.tick_count}")
+    print(f"Data saved to {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fork one Baseline warm-up into the scenario variants")
+    parser.add_argument("--warmup", type=int, default=300, help="ticks simulated before forking")
+    parser.add_argument("--max-ticks", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the warm-up run")
+    parser.add_argument("--output", default="branches.csv")
+    parser.add_argument("--warmup-checkpoint", default="warmup.ckpt")
+    args = parser.parse_args()
+    run_branches(args.warmup, args.max_ticks, args.seed, args.output, args.warmup_checkpoint)
@@ -0,0 +1,188 @@
+"""Typed scenario and parameter objects, loadable from TOML or JSON
+
+Parameters holds every agent rule constant the engines read: energies,
+metabolism, speeds, vision, eating / hunting distances, hunt probability,
+reproduction and regrowth. Scenario adds the run number, description and
+initial populations. Both engines take a Parameters object directly, so any
+number of differently configured runs can share a process and parameter
+grids are just lists of objects.
+
+A scenario file holds a list of scenarios and optional shared parameters:
+
+    [parameters]              # applied to every scenario in the file
+    hunt_probability = 0.6
+
+    [[scenario]]
+    run_number = 1
+    description = "Baseline"
+    initial_prey = 50         # counts default to the baseline 50/10/400/600
+
+    [[scenario]]
+    run_number = 2
+    description = "Hungry"
+    parameters = { prey_metabolism = 0.8, predator_metabolism = 1.5 }
+
+JSON files use the same structure ({"parameters": {...}, "scenario": [...]}).
+"""
+import dataclasses
+import json
+from dataclasses import dataclass, field
+
+# Version of the simulation rules. Bump it in any change that alters seeded
+# trajectories of either engine, so cached outcomes (sensitivity.RunCache)
+# from older rules are not reused.
+RULES_VERSION = 3
+
+# Age-based rules are measured in simulation ticks, never wall-clock time, so a
+# run gives the same trajectory at 30 FPS, uncapped or headless.
+# (Ages were 15 s / 5 s / 40 s at the original 30 FPS.)
+PREY_REPRODUCTION_AGE = 450  # ticks
+FAST_REPRODUCTION_AGE = 150  # ticks
+SLOW_REPRODUCTION_AGE = 1200  # ticks
+
+
+@dataclass(frozen=True)
+class Parameters:
+    """Agent rules shared by every agent of a run; defaults are the baseline rules"""
+    # Prey
+    prey_start_energy: float = 150
+    prey_max_energy: float = 500
+    prey_metabolism: float = 0.5  # Energy used per tick
+    prey_speed: float = 1.3
+    prey_vision: float = 150
+    food_energy: float = 20  # Energy gained per meal
+    eat_distance: float = 10
+    reproduction_age: int = PREY_REPRODUCTION_AGE  # Ticks before reproducing
+    litter_size: int = 2
+    birth_spread: int = 30  # Offspring land up to this far from the parent
+
+    # Predators
+    predator_start_energy: float = 120
+    predator_max_energy: float = 200
+    predator_metabolism: float = 1.0
+    predator_speed: float = 1.7
+    predator_vision: float = 200
+    hunt_distance: float = 15
+    hunt_probability: float = 0.7
+    kill_energy: float = 30  # Energy gained per prey caught
+
+    # Resources
+    regrow_min: int = 100  # Regrow time in ticks, drawn uniformly from [regrow_min, regrow_max]
+    regrow_max: int = 300
+
+    def __post_init__(self):
+        for spec in dataclasses.fields(self):
+            value = getattr(self, spec.name)
+            allowed, kind = ((int, float), "a number") if spec.type is float else (int, "an integer")
+            if isinstance(value, bool) or not isinstance(value, allowed):
+                raise ValueError(f"{spec.name} must be {kind}, got {value!r}")
+            if value < 0:
+                raise ValueError(f"{spec.name} must not be negative, got {value!r}")
+        if not 0 <= self.hunt_probability <= 1:
+            raise ValueError(f"hunt_probability must be between 0 and 1, got {self.hunt_probability!r}")
+        if self.regrow_min > self.regrow_max:
+            raise ValueError(f"regrow_min ({self.regrow_min}) is larger than regrow_max ({self.regrow_max})")
+
+    def replace(self, **changes):
+        return dataclasses.replace(self, **changes)
+
+    @property
+    def search_reach(self):
+        """Furthest any agent looks: experienced prey search up to twice their vision"""
+        return max(2 * self.prey_vision, self.predator_vision)
+
+    def changes(self):
+        """{name: value} of the fields that differ from the baseline rules"""
+        return {name: value for name, value in dataclasses.asdict(self).items()
+                if value != BASELINE_PARAMETERS_DICT[name]}
+
+    @classmethod
+    def from_dict(cls, data):
+        unknown = set(data) - {spec.name for spec in dataclasses.fields(cls)}
+        if unknown:
+            raise ValueError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+        return cls(**data)
+
+
+BASELINE_PARAMETERS_DICT = dataclasses.asdict(Parameters())
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """One configured run: populations and rules"""
+    run_number: int
+    description: str
+    initial_prey: int = 50
+    initial_predators: int = 10
+    initial_resources: int = 400
+    max_resources: int = 600
+    parameters: Parameters = field(default_factory=Parameters)
+
+    @property
+    def counts(self):
+        """(initial_prey, initial_predators, initial_resources, max_resources)"""
+        return (self.initial_prey, self.initial_predators, self.initial_resources, self.max_resources)
+
+    def parameters_changed(self):
+        """Describe everything that differs from the baseline scenario, e.g. for the CSV output"""
+        changes = []
+        for name, value, baseline in (('prey', self.initial_prey, 50), ('predators', self.initial_predators, 10),
+                                      ('resources', self.initial_resources, 400),
+                                      ('max_resources', self.max_resources, 600)):
+            if value != baseline:
+                changes.append(f"{name}={value}(baseline:{baseline})")
+        for name, value in self.parameters.changes().items():
+            changes.append(f"{name}={value}(baseline:{BASELINE_PARAMETERS_DICT[name]})")
+
+        if not changes:
+            return "baseline_parameters"
+        return "; ".join(changes)
+
+    def to_dict(self):
+        """Plain dict with only the changed parameters (JSON-friendly)"""
+        data = dataclasses.asdict(self)
+        data['parameters'] = self.parameters.changes()
+        return data
+
+    @classmethod
+    def from_dict(cls, data, base_parameters=None):
+        data = dict(data)
+        parameters = dict(base_parameters or {}, **data.pop('parameters', {}))
+        unknown = set(data) - {spec.name for spec in dataclasses.fields(cls)}
+        if unknown:
+            raise ValueError(f"Unknown scenario settings: {', '.join(sorted(unknown))}")
+        for name in ('run_number', 'initial_prey', 'initial_predators', 'initial_resources', 'max_resources'):
+            if name in data and (isinstance(data[name], bool) or not isinstance(data[name], int)):
+                raise ValueError(f"{name} must be an integer, got {data[name]!r}")
+        return cls(parameters=Parameters.from_dict(parameters), **data)
+
+
+def load_scenarios(path):
+    """Read a list of Scenario from a .toml or .json file"""
+    if path.endswith('.toml'):
+        import tomllib
+        with open(path, 'rb') as file:
+            data = tomllib.load(file)
+    else:
+        with open(path) as file:
+            data = json.load(file)
+    base_parameters = data.get('parameters', {})
+    return [Scenario.from_dict(scenario, base_parameters) for scenario in data.get('scenario', [])]
+
+
+# The 10 scenario configurations
+SCENARIOS = [
+    Scenario(1, "Baseline"),
+    Scenario(2, "Very High Resources", initial_resources=800, max_resources=1200),
+    Scenario(3, "Very Low Resources", initial_resources=100, max_resources=150),
+    Scenario(4, "Many Predators", initial_predators=40),
+    Scenario(5, "Very Few Predators", initial_predators=3),
+    # Metabolism is the total energy drain per tick; these keep the drain the
+    # old scenario patches added on top of the normal 0.5 (prey) / 1.0
+    # (predator), so "Slow Metabolism" still drains slightly more than baseline
+    Scenario(6, "Fast Metabolism", parameters=Parameters(prey_metabolism=2.0, predator_metabolism=4.0)),
+    Scenario(7, "Slow Metabolism", parameters=Parameters(prey_metabolism=0.7, predator_metabolism=1.4)),
+    Scenario(8, "Fast Reproduction", parameters=Parameters(reproduction_age=FAST_REPRODUCTION_AGE)),
+    Scenario(9, "Slow Reproduction", parameters=Parameters(reproduction_age=SLOW_REPRODUCTION_AGE)),
+    Scenario(10, "Balanced Large", 80, 15, 600, 800),
+]
@@ -1,501 +1,834 @@
-import pygame
-import random
-import math
-import csv
-import time
-from datetime import datetime
-
-# Initialize pygame
-pygame.init()
-screen_width = 800
-screen_height = 600
-screen = pygame.display.set_mode((screen_width, screen_height))
-pygame.display.set_caption("Ecosystem Simulation - 10 Runs")
-clock = pygame.time.Clock()
-
-# Colors
-GREEN = (0, 255, 0)
-RED = (255, 0, 0)
-BROWN = (139, 69, 19)
-DARK_GREEN = (0, 100, 0)
-WHITE = (255, 255, 255)
-
-class Prey:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.energy = 150
-        self.max_energy = 500
-        self.speed = 1.3
-        self.vision = 150
-        self.birth_time = time.time()
-        self.has_reproduced = False
-        
-        # LEARNING ALGORITHM: Simple success tracking
-        self.successful_actions = 0
-        self.total_actions = 0
-        self.learning_level = 0.0  # 0 to 1, how much prey has learned
-        
-    def learn_from_experience(self, action_successful):
-        """Prey learn from their experiences"""
-        self.total_actions += 1
-        if action_successful:
-            self.successful_actions += 1
-        
-        # Update learning level based on success rate
-        if self.total_actions > 5:  # After some experience
-            self.learning_level = min(1.0, self.successful_actions / self.total_actions)
-    
-    def make_smart_move(self, resources):
-        """ Use learning to make better decisions"""
-        # More experienced prey are better at finding food
-        if self.learning_level > 0.3:
-            # Look for closest food more efficiently
-            closest_food = None
-            closest_distance = 1000
-            
-            for resource in resources:
-                if resource.has_food:
-                    distance = math.sqrt((self.x - resource.x)**2 + (self.y - resource.y)**2)
-                    # Experienced prey have better "search intuition"
-                    if distance < self.vision * (1 + self.learning_level) and distance < closest_distance:
-                        closest_distance = distance
-                        closest_food = resource
-            
-            if closest_food:
-                return closest_food
-        
-        return None
-    
-    def move_random(self):
-        self.x += random.randint(-4, 4)
-        self.y += random.randint(-4, 4)
-        self.x = max(5, min(self.x, screen_width - 5))
-        self.y = max(5, min(self.y, screen_height - 5))
-        
-    def move_towards_food(self, food_x, food_y):
-        dx = food_x - self.x
-        dy = food_y - self.y
-        dist = max(1, math.sqrt(dx*dx + dy*dy))
-        self.x += (dx/dist) * self.speed
-        self.y += (dy/dist) * self.speed
-        
-    def eat(self, resource):
-        if resource.has_food:
-            resource.has_food = False
-            self.energy = min(self.max_energy, self.energy + 20)
-            self.learn_from_experience(True)  # LEARNING: Successful eat
-            return True
-        self.learn_from_experience(False)  # LEARNING: Failed eat
-        return False
-        
-    def update(self, resources):
-        self.energy -= 0.5
-        
-        # Use learning to find food smarter
-        smart_target = self.make_smart_move(resources)
-        
-        if smart_target:
-            self.move_towards_food(smart_target.x, smart_target.y)
-            distance = math.sqrt((self.x - smart_target.x)**2 + (self.y - smart_target.y)**2)
-            if distance < 10:
-                self.eat(smart_target)
-        else:
-            # Fall back to normal behavior
-            closest_food = None
-            closest_distance = 1000
-            
-            for resource in resources:
-                if resource.has_food:
-                    distance = math.sqrt((self.x - resource.x)**2 + (self.y - resource.y)**2)
-                    if distance < self.vision and distance < closest_distance:
-                        closest_distance = distance
-                        closest_food = resource
-            
-            if closest_food:
-                self.move_towards_food(closest_food.x, closest_food.y)
-                if closest_distance < 10:
-                    self.eat(closest_food)
-            else:
-                self.move_random()
-                self.learn_from_experience(False)  # LEARNING: Wandering is less successful
-            
-    def is_alive(self):
-        return self.energy > 0
-        
-    def should_reproduce(self):
-        current_time = time.time()
-        survival_time = current_time - self.birth_time
-        if survival_time > 15 and not self.has_reproduced:
-            self.has_reproduced = True
-            return True
-        return False
-        
-    def draw(self):
-        # Color shows learning level (darker green = more learned)
-        green_value = int(255 * (1 - self.learning_level * 0.5))
-        color = (0, green_value, 0)
-        pygame.draw.circle(screen, color, (int(self.x), int(self.y)), 4)
-
-class Predator:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.energy = 120
-        self.max_energy = 200
-        self.speed = 1.7
-        self.vision = 200
-        self.prey_eaten = 0
-        
-    def move_random(self):
-        self.x += random.randint(-4, 4)
-        self.y += random.randint(-4, 4)
-        self.x = max(5, min(self.x, screen_width - 5))
-        self.y = max(5, min(self.y, screen_height - 5))
-        
-    def move_towards_prey(self, prey_x, prey_y):
-        dx = prey_x - self.x
-        dy = prey_y - self.y
-        dist = max(1, math.sqrt(dx*dx + dy*dy))
-        self.x += (dx/dist) * self.speed
-        self.y += (dy/dist) * self.speed
-        
-    def hunt(self, prey):
-        if random.random() < 0.7:
-            self.prey_eaten += 1
-            self.energy = min(self.max_energy, self.energy + 30)
-            return True
-        return False
-        
-    def update(self, preys):
-        self.energy -= 1
-        
-        closest_prey = None
-        closest_distance = 1000
-        
-        for prey in preys:
-            distance = math.sqrt((self.x - prey.x)**2 + (self.y - prey.y)**2)
-            if distance < self.vision and distance < closest_distance:
-                closest_distance = distance
-                closest_prey = prey
-        
-        if closest_prey:
-            self.move_towards_prey(closest_prey.x, closest_prey.y)
-            if closest_distance < 15:
-                if self.hunt(closest_prey):
-                    preys.remove(closest_prey)
-        else:
-            self.move_random()
-            
-    def is_alive(self):
-        return self.energy > 0
-        
-    def draw(self):
-        pygame.draw.circle(screen, RED, (int(self.x), int(self.y)), 6)
-
-class Resource:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.has_food = True
-        self.regrow_timer = random.randint(100, 300)  # Different regrow times
-        
-    def update(self):
-        if not self.has_food:
-            self.regrow_timer -= 1
-            if self.regrow_timer <= 0:
-                self.has_food = True
-                self.regrow_timer = random.randint(100, 300)
-                
-    def draw(self):
-        if self.has_food:
-            pygame.draw.circle(screen, DARK_GREEN, (int(self.x), int(self.y)), 3)
-        else:
-            pygame.draw.circle(screen, BROWN, (int(self.x), int(self.y)), 2)
-
-def get_parameters_changed(description, prey, predators, resources, max_resources):
-    """Generate a string describing what parameters were changed for this run"""
-    baseline_prey = 50
-    baseline_predators = 10
-    baseline_resources = 400
-    baseline_max_resources = 600
-    
-    changes = []
-    
-    if prey != baseline_prey:
-        changes.append(f"prey={prey}(baseline:{baseline_prey})")
-    if predators != baseline_predators:
-        changes.append(f"predators={predators}(baseline:{baseline_predators})")
-    if resources != baseline_resources:
-        changes.append(f"resources={resources}(baseline:{baseline_resources})")
-    if max_resources != baseline_max_resources:
-        changes.append(f"max_resources={max_resources}(baseline:{baseline_max_resources})")
-    
-    # Add special condition changes
-    if "Fast Metabolism" in description:
-        changes.append("metabolism=3x_faster")
-    elif "Slow Metabolism" in description:
-        changes.append("metabolism=3x_slower")
-    elif "Fast Reproduction" in description:
-        changes.append("reproduction=3x_faster")
-    elif "Slow Reproduction" in description:
-        changes.append("reproduction=3x_slower")
-    
-    if not changes:
-        return "baseline_parameters"
-    
-    return "; ".join(changes)
-
-def run_simulation(run_number, description, initial_prey=50, initial_predators=10, 
-                  initial_resources=150, max_resources=300, max_ticks=2000):
-    """Run one simulation and save results to a numbered CSV file"""
-    
-    print(f"Starting Run {run_number:03d}: {description}")
-    
-    # Get parameters changed for this run
-    parameters_changed = get_parameters_changed(description, initial_prey, initial_predators, 
-                                              initial_resources, max_resources)
-    
-    # Create objects
-    preys = [Prey(random.randint(50, screen_width-50), random.randint(50, screen_height-50)) 
-            for _ in range(initial_prey)]
-    predators = [Predator(random.randint(50, screen_width-50), random.randint(50, screen_height-50)) 
-                for _ in range(initial_predators)]
-    resources = [Resource(random.randint(20, screen_width-20), random.randint(20, screen_height-20)) 
-                for _ in range(initial_resources)]
-    
-    # Data collection for this run
-    run_data = []
-    tick_count = 0
-    predator_extinction_tick = None  # Track when predators went extinct
-    
-    # Update window title
-    pygame.display.set_caption(f"Ecosystem Simulation - Run {run_number:03d}")
-    
-    running = True
-    while running and tick_count < max_ticks and (preys or predators):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-        
-        # Clear screen
-        screen.fill((50, 120, 80))
-        
-        # Update and draw resources
-        for resource in resources:
-            resource.update()
-            resource.draw()
-        
-        # Update prey
-        new_preys = []
-        for prey in preys[:]:
-            prey.update(resources)
-            if prey.is_alive():
-                prey.draw()
-                if prey.should_reproduce():
-                    for i in range(2):
-                        new_x = prey.x + random.randint(-30, 30)
-                        new_y = prey.y + random.randint(-30, 30)
-                        new_x = max(5, min(new_x, screen_width - 5))
-                        new_y = max(5, min(new_y, screen_height - 5))
-                        new_preys.append(Prey(new_x, new_y))
-            else:
-                preys.remove(prey)
-        
-        preys.extend(new_preys)
-        
-        # Update predators
-        for predator in predators[:]:
-            predator.update(preys)
-            if predator.is_alive():
-                predator.draw()
-            else:
-                predators.remove(predator)
-        
-        # If no predators for 300 ticks, spawn 3 new ones
-        if len(predators) == 0:
-            if predator_extinction_tick is None:
-                predator_extinction_tick = tick_count  # Record when predators went extinct
-                print(f"  Predators went extinct at tick {tick_count}")
-            
-            # Check if 300 ticks have passed since extinction
-            if tick_count - predator_extinction_tick >= 300:
-                print(f"  Respawning 3 predators at tick {tick_count}")
-                for i in range(3):
-                    predators.append(Predator(random.randint(50, screen_width-50), 
-                                            random.randint(50, screen_height-50)))
-                predator_extinction_tick = None  # Reset for potential future extinctions
-        else:
-            predator_extinction_tick = None  # Reset if predators exist
-        
-        # Add resources if needed - MORE FREQUENT RESOURCE SPAWNING
-        tick_count += 1
-        if tick_count % 25 == 0 and len(resources) < max_resources:
-            resources.append(Resource(random.randint(20, screen_width-20), random.randint(20, screen_height-20)))
-        
-        # Collect data every 50 ticks
-        if tick_count % 50 == 0:
-            avg_learning = sum(p.learning_level for p in preys) / len(preys) if preys else 0
-            run_data.append({
-                'tick': tick_count,
-                'prey_count': len(preys),
-                'predator_count': len(predators),
-                'resource_count': sum(1 for r in resources if r.has_food),
-                'avg_learning': round(avg_learning, 3),
-                'total_prey_eaten': sum(p.prey_eaten for p in predators),
-                'predators_respawned': 1 if predator_extinction_tick and tick_count - predator_extinction_tick >= 300 else 0,
-                'parameters_changed': parameters_changed
-            })
-        
-        # Display stats
-        font = pygame.font.Font(None, 24)
-        current_avg_learning = sum(p.learning_level for p in preys) / len(preys) if preys else 0
-        
-        # Show predator respawn status
-        predator_status = f"Predators: {len(predators)}"
-        if predator_extinction_tick is not None:
-            ticks_since_extinction = tick_count - predator_extinction_tick
-            predator_status = f"Predators: 0 (Respawning in {300-ticks_since_extinction} ticks)"
-        
-        stats = [
-            f"Run {run_number:03d}: {description}",
-            f"Tick: {tick_count}/{max_ticks}",
-            f"Prey: {len(preys)}",
-            predator_status,
-            f"Food: {sum(1 for r in resources if r.has_food)}",
-            f"Avg Learning: {current_avg_learning:.2f}",
-            f"Params: {parameters_changed[:30]}..." if len(parameters_changed) > 30 else f"Params: {parameters_changed}"
-        ]
-        for i, stat in enumerate(stats):
-            text = font.render(stat, True, WHITE)
-            screen.blit(text, (10, 10 + i * 25))
-        
-        pygame.display.flip()
-        clock.tick(30)
-    
-    # Save results to numbered CSV file
-    filename = f"run_{run_number:03d}.csv"
-    with open(filename, 'w', newline='') as file:
-        writer = csv.writer(file)
-        writer.writerow(['Run_Number', 'Description', 'Tick', 'Prey_Count', 'Predator_Count', 
-                        'Resource_Count', 'Avg_Learning', 'Total_Prey_Eaten', 'Predators_Respawned',
-                        'Parameters_Changed'])
-        
-        for data_point in run_data:
-            writer.writerow([
-                run_number, description, data_point['tick'], data_point['prey_count'],
-                data_point['predator_count'], data_point['resource_count'],
-                data_point['avg_learning'], data_point['total_prey_eaten'],
-                data_point['predators_respawned'], data_point['parameters_changed']
-            ])
-    
-    final_prey = len(preys)
-    final_predators = len(predators)
-    print(f"Run {run_number:03d} completed at tick {tick_count}: {final_prey} prey, {final_predators} predators")
-    print(f"Parameters: {parameters_changed}")
-    print(f"Data saved to {filename}")
-    
-    return final_prey, final_predators, tick_count, parameters_changed
-
-# Run all 10 simulations 
-def run_all_simulations():
-    simulations = [
-        # (run_number, description, prey, predators, resources, max_resources)
-        (1, "Baseline", 50, 10, 400, 600),          
-        (2, "Very High Resources", 50, 10, 800, 1200), 
-        (3, "Very Low Resources", 50, 10, 100, 150),  
-        (4, "Many Predators", 50, 40, 400, 600),       
-        (5, "Very Few Predators", 50, 3, 400, 600),    
-        (6, "Fast Metabolism", 50, 10, 400, 600),      
-        (7, "Slow Metabolism", 50, 10, 400, 600),      
-        (8, "Fast Reproduction", 50, 10, 400, 600),    
-        (9, "Slow Reproduction", 50, 10, 400, 600),    
-        (10, "Balanced Large", 80, 15, 600, 800), 
-    ]
-    
-    results = []
-    for run_num, desc, prey, pred, res, max_res in simulations:
-        # Apply variations based on run type
-        if desc == "Fast Metabolism":
-            # Modify prey and predator metabolism
-            Prey.original_update = Prey.update
-            Predator.original_update = Predator.update
-            
-            def fast_metabolism_prey_update(self, resources):
-                self.energy -= 1.5  # Much faster energy drain
-                Prey.original_update(self, resources)
-            
-            def fast_metabolism_predator_update(self, preys):
-                self.energy -= 3.0  # Much faster energy drain
-                Predator.original_update(self, preys)
-            
-            Prey.update = fast_metabolism_prey_update
-            Predator.update = fast_metabolism_predator_update
-            
-        elif desc == "Slow Metabolism":
-            Prey.original_update = Prey.update
-            Predator.original_update = Predator.update
-            
-            def slow_metabolism_prey_update(self, resources):
-                self.energy -= 0.2  # Much slower energy drain
-                Prey.original_update(self, resources)
-            
-            def slow_metabolism_predator_update(self, preys):
-                self.energy -= 0.4  # Much slower energy drain
-                Predator.original_update(self, preys)
-            
-            Prey.update = slow_metabolism_prey_update
-            Predator.update = slow_metabolism_predator_update
-            
-        elif desc == "Fast Reproduction":
-            Prey.original_should_reproduce = Prey.should_reproduce
-            
-            def fast_reproduction(self):
-                current_time = time.time()
-                survival_time = current_time - self.birth_time
-                if survival_time > 5 and not self.has_reproduced:  # Much faster reproduction
-                    self.has_reproduced = True
-                    return True
-                return False
-            
-            Prey.should_reproduce = fast_reproduction
-            
-        elif desc == "Slow Reproduction":
-            Prey.original_should_reproduce = Prey.should_reproduce
-            
-            def slow_reproduction(self):
-                current_time = time.time()
-                survival_time = current_time - self.birth_time
-                if survival_time > 40 and not self.has_reproduced:  # Much slower reproduction
-                    self.has_reproduced = True
-                    return True
-                return False
-            
-            Prey.should_reproduce = slow_reproduction
-        
-        final_prey, final_pred, final_tick, params = run_simulation(run_num, desc, prey, pred, res, max_res, max_ticks=1000)
-        results.append((run_num, desc, final_prey, final_pred, final_tick, params))
-        
-        # Reset to default behaviors for next run
-        if hasattr(Prey, 'original_update'):
-            Prey.update = Prey.original_update
-        if hasattr(Predator, 'original_update'):
-            Predator.update = Predator.original_update
-        if hasattr(Prey, 'original_should_reproduce'):
-            Prey.should_reproduce = Prey.original_should_reproduce
-        
-        # Small pause between runs
-        time.sleep(1)
-    
-    print("\n" + "="*50)
-    print("ALL SIMULATIONS COMPLETED - SUMMARY")
-    print("="*50)
-    for run_num, desc, prey, pred, tick, params in results:
-        status = "STABLE" if prey > 0 and pred > 0 else "EXTINCT"
-        print(f"Run {run_num:02d} ({desc}): {prey} prey, {pred} predators at tick {tick} - {status}")
-        print(f"  Parameters: {params}")
-
-# Start the simulations
-if __name__ == "__main__":
-    run_all_simulations()
-    pygame.quit()
+import random
+import math
+import heapq
+import time
+import argparse
+from datetime import datetime
+
+from spatial import World
+from metrics import CSVSink, ColumnarSink, MemorySink, reopen_sink
+from stats import PopulationStats
+from population import Population
+from profiling import TickProfiler
+from config import Parameters, Scenario, SCENARIOS, load_scenarios
+from checkpoint import Checkpointer, load_checkpoint
+
+screen_width = 800
+screen_height = 600
+
+class RandomStreams:
+    """Seeded random number streams owned by one run
+    
+    Movement, predation, regrowth and spawning each draw from their own
+    random.Random derived from the run seed, so a seed reproduces a run
+    exactly in any execution mode or worker process. Without a seed one is
+    drawn from the global random module and kept in self.seed.
+    """
+    NAMES = ('movement', 'predation', 'regrowth', 'spawning')
+    
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.getrandbits(32)
+        self.seed = seed
+        for name in self.NAMES:
+            setattr(self, name, random.Random(f"{seed}:{name}"))
+
+def run_seed(base_seed, run_number, replicate=0):
+    """Deterministic 32-bit seed for one replicate of one scenario"""
+    return random.Random(f"{base_seed}:{run_number}:{replicate}").getrandbits(32)
+
+def world_changed(parameters_changed, world):
+    """Add the world size and wrap to a parameters_changed description when they are not the default"""
+    changes = []
+    if (world.width, world.height) != (screen_width, screen_height):
+        changes.append(f"world={world.width}x{world.height}(baseline:{screen_width}x{screen_height})")
+    if world.wrap:
+        changes.append("wrap=True(baseline:False)")
+    if not changes:
+        return parameters_changed
+    if parameters_changed != "baseline_parameters":
+        changes.insert(0, parameters_changed)
+    return "; ".join(changes)
+
+def world_metadata(world):
+    """Run metadata fields that describe the world"""
+    return {'width': world.width, 'height': world.height, 'wrap': world.wrap}
+
+class Prey:
+    owned = True  # False for the shards.Ghost copies of prey owned by another shard
+    
+    def __init__(self, x, y, parameters, birth_tick=0):
+        self.x = x
+        self.y = y
+        self.energy = parameters.prey_start_energy
+        self.set_parameters(parameters)
+        self.birth_tick = birth_tick
+        self.has_reproduced = False
+        
+        # LEARNING ALGORITHM: Simple success tracking
+        self.successful_actions = 0
+        self.total_actions = 0
+        self.learning_level = 0.0  # 0 to 1, how much prey has learned
+        
+    def learn_from_experience(self, action_successful):
+        """Prey learn from their experiences"""
+        self.total_actions += 1
+        if action_successful:
+            self.successful_actions += 1
+        
+        # Update learning level based on success rate
+        if self.total_actions > 5:  # After some experience
+            self.learning_level = min(1.0, self.successful_actions / self.total_actions)
+    
+    def set_parameters(self, parameters):
+        """Copy this prey's rules from a config.Parameters"""
+        self.max_energy = parameters.prey_max_energy
+        self.speed = parameters.prey_speed
+        self.vision = parameters.prey_vision
+        self.metabolism = parameters.prey_metabolism  # Energy used per tick
+        self.food_energy = parameters.food_energy
+        self.eat_distance = parameters.eat_distance
+        self.reproduction_age = parameters.reproduction_age  # Ticks before reproducing
+    
+    def make_smart_move(self, food_index):
+        """ Use learning to make better decisions"""
+        # More experienced prey are better at finding food
+        if self.learning_level > 0.3:
+            # Look for closest food more efficiently
+            # Experienced prey have better "search intuition"
+            closest_food, closest_distance = food_index.nearest(self.x, self.y,
+                                                                self.vision * (1 + self.learning_level))
+            if closest_food:
+                return closest_food
+        
+        return None
+    
+    def move_random(self, rng, world):
+        self.x += rng.randint(-4, 4)
+        self.y += rng.randint(-4, 4)
+        self.x, self.y = world.clamp(self.x, self.y, 5)
+        
+    def move_towards_food(self, food_x, food_y, world):
+        dx, dy = world.offset(self.x, self.y, food_x, food_y)
+        dist = max(1, math.sqrt(dx*dx + dy*dy))
+        self.x += (dx/dist) * self.speed
+        self.y += (dy/dist) * self.speed
+        if world.wrap:
+            self.x, self.y = world.clamp(self.x, self.y, 0)
+        
+    def eat(self, resource):
+        if resource.has_food:
+            resource.has_food = False
+            self.energy = min(self.max_energy, self.energy + self.food_energy)
+            self.learn_from_experience(True)  # LEARNING: Successful eat
+            return True
+        self.learn_from_experience(False)  # LEARNING: Failed eat
+        return False
+        
+    def update(self, food_index, streams, world):
+        """Move and forage in world; food_index holds the resources that have food.
+        
+        Returns the resource eaten this tick (or None) so the caller can
+        drop it from the index.
+        """
+        self.energy -= self.metabolism
+        
+        # Use learning to find food smarter
+        smart_target = self.make_smart_move(food_index)
+        
+        if smart_target:
+            self.move_towards_food(smart_target.x, smart_target.y, world)
+            distance = world.distance(self.x, self.y, smart_target.x, smart_target.y)
+            if distance < self.eat_distance and smart_target.owned and self.eat(smart_target):
+                return smart_target
+        else:
+            # Fall back to normal behavior
+            closest_food, closest_distance = food_index.nearest(self.x, self.y, self.vision)
+            
+            if closest_food:
+                self.move_towards_food(closest_food.x, closest_food.y, world)
+                if closest_distance < self.eat_distance and closest_food.owned and self.eat(closest_food):
+                    return closest_food
+            else:
+                self.move_random(streams.movement, world)
+                self.learn_from_experience(False)  # LEARNING: Wandering is less successful
+        return None
+            
+    def is_alive(self):
+        return self.energy > 0
+        
+    def should_reproduce(self, tick):
+        survival_time = tick - self.birth_tick
+        if survival_time > self.reproduction_age and not self.has_reproduced:
+            self.has_reproduced = True
+            return True
+        return False
+
+class Predator:
+    def __init__(self, x, y, parameters):
+        self.x = x
+        self.y = y
+        self.energy = parameters.predator_start_energy
+        self.set_parameters(parameters)
+        self.prey_eaten = 0
+    
+    def set_parameters(self, parameters):
+        """Copy this predator's rules from a config.Parameters"""
+        self.max_energy = parameters.predator_max_energy
+        self.speed = parameters.predator_speed
+        self.vision = parameters.predator_vision
+        self.metabolism = parameters.predator_metabolism  # Energy used per tick
+        self.hunt_distance = parameters.hunt_distance
+        self.hunt_probability = parameters.hunt_probability
+        self.kill_energy = parameters.kill_energy
+        
+    def move_random(self, rng, world):
+        self.x += rng.randint(-4, 4)
+        self.y += rng.randint(-4, 4)
+        self.x, self.y = world.clamp(self.x, self.y, 5)
+        
+    def move_towards_prey(self, prey_x, prey_y, world):
+        dx, dy = world.offset(self.x, self.y, prey_x, prey_y)
+        dist = max(1, math.sqrt(dx*dx + dy*dy))
+        self.x += (dx/dist) * self.speed
+        self.y += (dy/dist) * self.speed
+        if world.wrap:
+            self.x, self.y = world.clamp(self.x, self.y, 0)
+        
+    def hunt(self, rng):
+        """Roll one hunt; the kill itself is granted by Simulation.resolve_hunts"""
+        return rng.random() < self.hunt_probability
+    
+    def feed(self):
+        self.prey_eaten += 1
+        self.energy = min(self.max_energy, self.energy + self.kill_energy)
+        
+    def update(self, prey_index, streams, world):
+        """Chase the nearest prey in prey_index across world
+        
+        Returns (prey, distance) when the hunt on that prey succeeds, else
+        (None, None). Nothing is killed here: the prey stays in the index
+        so every predator of the tick sees the same prey.
+        """
+        self.energy -= self.metabolism
+        
+        closest_prey, closest_distance = prey_index.nearest(self.x, self.y, self.vision)
+        
+        if closest_prey:
+            self.move_towards_prey(closest_prey.x, closest_prey.y, world)
+            if (closest_distance < self.hunt_distance and closest_prey.owned
+                    and self.hunt(streams.predation)):
+                return closest_prey, closest_distance
+        else:
+            self.move_random(streams.movement, world)
+        return None, None
+            
+    def is_alive(self):
+        return self.energy > 0
+
+class Resource:
+    owned = True  # False for the shards.Ghost copies of food owned by another shard
+    
+    def __init__(self, x, y, rng, parameters):
+        self.x = x
+        self.y = y
+        self.has_food = True
+        self.set_parameters(parameters)
+        self.regrow_timer = rng.randint(self.regrow_min, self.regrow_max)  # Different regrow times
+    
+    def set_parameters(self, parameters):
+        self.regrow_min = parameters.regrow_min
+        self.regrow_max = parameters.regrow_max
+        
+    def regrow(self, rng):
+        """Bring the food back and draw the wait for the next regrowth"""
+        self.has_food = True
+        self.regrow_timer = rng.randint(self.regrow_min, self.regrow_max)
+
+class Simulation:
+    """World state for one run, advanced one tick at a time with step()
+    
+    parameters (a config.Parameters, baseline rules by default) sets the
+    rules of every agent the run creates. All randomness comes from
+    self.random, seeded by seed. self.stats keeps running counts, means and
+    totals, updated on every event.
+    
+    The world is width x height (the screen size by default); with
+    wrap=True its opposite edges join (a torus) instead of stopping agents.
+    """
+    def __init__(self, initial_prey=50, initial_predators=10, initial_resources=150, max_resources=300,
+                 parameters=None, seed=None, verbose=True, width=None, height=None, wrap=False):
+        self.random = RandomStreams(seed)
+        self.seed = self.random.seed
+        spawning = self.random.spawning
+        self.parameters = parameters or Parameters()
+        self.world = world = World(width or screen_width, height or screen_height, wrap)
+        self.verbose = verbose
+        self.profiler = None  # profiling.TickProfiler while a profiled run_loop is active
+        self.respawn_predators = True  # shards.ShardedSimulation respawns for the whole world instead
+        self.tick_count = 0
+        self.predator_extinction_tick = None  # Track when predators went extinct
+        self.next_serial = 0  # Agents are numbered in the order they join the run
+        self.preys = Population(self.new_prey(spawning.randint(50, world.width-50), spawning.randint(50, world.height-50)) 
+                                for _ in range(initial_prey))
+        self.predators = Population(self.new_predator(spawning.randint(50, world.width-50), spawning.randint(50, world.height-50)) 
+                                    for _ in range(initial_predators))
+        self.resources = [self.new_resource() for _ in range(initial_resources)]
+        self.max_resources = max_resources
+        # Eaten patches as (regrowth tick, serial, resource); a patch waits here instead of counting down every tick
+        self.regrowth_queue = []
+        
+        # Spatial indexes for nearest-target lookups, cell size tied to vision
+        self.food_index = world.grid(self.parameters.prey_vision)  # Resources that currently have food
+        self.prey_index = world.grid(self.parameters.predator_vision)
+        self.stats = PopulationStats()
+        for resource in self.resources:
+            self.food_index.insert(resource)
+            self.stats.resource_added(resource)
+        for prey in self.preys:
+            self.prey_index.insert(prey)
+            self.stats.prey_born(prey)
+        for predator in self.predators:
+            self.stats.predator_born(predator)
+    
+    def number(self, agent):
+        """Give an agent the next serial number
+        
+        Agents join their lists in serial order, so the spatial indexes can
+        break distance ties by serial exactly like a scan of the list would.
+        """
+        agent.serial = self.next_serial
+        self.next_serial += 1
+        return agent
+    
+    def new_prey(self, x, y):
+        return self.number(Prey(x, y, self.parameters, birth_tick=self.tick_count))
+    
+    def new_predator(self, x, y):
+        return self.number(Predator(x, y, self.parameters))
+    
+    def new_resource(self):
+        spawning = self.random.spawning
+        return self.number(Resource(spawning.randint(20, self.world.width-20), spawning.randint(20, self.world.height-20),
+                                    self.random.regrowth, self.parameters))
+    
+    def is_active(self):
+        return bool(self.preys or self.predators)
+    
+    def add_agents(self, preys=(), predators=(), resources=(), born=False):
+        """Take in agents created elsewhere, e.g. migrating from another shard"""
+        stats = self.stats
+        for prey in preys:
+            self.number(prey)
+            self.preys.spawn(prey)
+            self.prey_index.insert(prey)
+            if born:
+                stats.prey_born(prey)
+            else:
+                stats.prey_added(prey)
+        for predator in predators:
+            self.number(predator)
+            self.predators.spawn(predator)
+            if born:
+                stats.predator_born(predator)
+            else:
+                stats.predator_added(predator)
+        for resource in resources:
+            self.number(resource)
+            self.resources.append(resource)
+            if resource.has_food:
+                self.food_index.insert(resource)
+            else:
+                self.schedule_regrowth(resource)
+            stats.resource_added(resource)
+        self.preys.commit()
+        self.predators.commit()
+    
+    def schedule_regrowth(self, resource):
+        """Queue an eaten patch for the tick its regrow_timer runs out"""
+        heapq.heappush(self.regrowth_queue,
+                       (self.tick_count + max(resource.regrow_timer, 1), resource.serial, resource))
+
+    def remove_agents(self, preys=(), predators=()):
+        """Hand agents over to another owner; they do not count as deaths"""
+        stats = self.stats
+        for prey in preys:
+            self.preys.kill(prey)
+            self.prey_index.remove(prey)
+            stats.prey_removed(prey)
+        for predator in predators:
+            self.predators.kill(predator)
+            stats.predator_removed(predator)
+        self.preys.commit()
+        self.predators.commit()
+
+    def configure(self, parameters=None, max_resources=None, **changes):
+        """Change the run's rules mid-run, including for the agents already alive
+        
+        parameters replaces the rules, changes replace single fields of
+        them (e.g. prey_metabolism=2.0). Used to branch a warm-up state into
+        scenario variants (see checkpoint.fork).
+        """
+        if max_resources is not None:
+            self.max_resources = max_resources
+        if parameters is not None or changes:
+            self.parameters = (parameters or self.parameters).replace(**changes)
+            for agent in [*self.preys, *self.predators, *self.resources]:
+                agent.set_parameters(self.parameters)
+
+    def reseed(self, seed):
+        """Continue with fresh random streams from seed"""
+        self.random = RandomStreams(seed)
+        self.seed = self.random.seed
+
+    def __getstate__(self):
+        # Checkpoints never carry a profiler
+        state = self.__dict__.copy()
+        state['profiler'] = None
+        return state
+
+    def step(self):
+        """Advance the world by one tick (no rendering, no frame cap)"""
+        preys = self.preys
+        predators = self.predators
+        resources = self.resources
+        food_index = self.food_index
+        prey_index = self.prey_index
+        streams = self.random
+        spawning = streams.spawning
+        world = self.world
+        stats = self.stats
+        litter_size = self.parameters.litter_size
+        birth_spread = self.parameters.birth_spread
+        profiler = self.profiler
+        food_search, prey_search = food_index, prey_index
+        if profiler:
+            food_search, prey_search = profiler.food_search, profiler.prey_search
+            start = profiler.clock()
+        
+        # Regrow the patches whose time has come, in list order within a tick
+        regrowth_queue = self.regrowth_queue
+        while regrowth_queue and regrowth_queue[0][0] <= self.tick_count:
+            resource = heapq.heappop(regrowth_queue)[2]
+            resource.regrow(streams.regrowth)
+            food_index.insert(resource)
+            stats.food_has_regrown()
+        if profiler:
+            start = profiler.mark('resource_regrowth', start)
+        
+        # Update prey; deaths and births are applied together by commit()
+        stats.prey_energy.begin_pass()
+        for prey in preys:
+            old_energy, old_learning = prey.energy, prey.learning_level
+            eaten = prey.update(food_search, streams, world)
+            stats.prey_updated(prey, old_energy, old_learning)
+            if eaten:
+                food_index.remove(eaten)
+                self.schedule_regrowth(eaten)
+                stats.food_was_eaten()
+            if prey.is_alive():
+                stats.prey_energy.observe(prey.energy)
+                prey_index.move(prey)
+                if prey.should_reproduce(self.tick_count):
+                    if profiler:
+                        born_start = profiler.clock()
+                    for i in range(litter_size):
+                        new_x = prey.x + spawning.randint(-birth_spread, birth_spread)
+                        new_y = prey.y + spawning.randint(-birth_spread, birth_spread)
+                        new_x, new_y = world.clamp(new_x, new_y, 5)
+                        preys.spawn(self.new_prey(new_x, new_y))
+                    if profiler:
+                        profiler.nested('reproduction', born_start)
+            else:
+                preys.kill(prey)
+                prey_index.remove(prey)
+                stats.prey_died(prey)
+        
+        for prey in preys.born:
+            prey_index.insert(prey)
+            stats.prey_born(prey)
+        preys.commit()
+        if profiler:
+            start = profiler.mark('prey_move_eat', start)
+        
+        # Update predators as one batch: all of them chase and hunt the prey
+        # alive at the start of the phase, then the kills are applied together
+        claims = {}  # prey -> (distance, predator) of its closest successful hunter
+        for predator in predators:
+            old_energy = predator.energy
+            target, distance = predator.update(prey_search, streams, world)
+            stats.predator_updated(predator, old_energy)
+            if target is not None:
+                claim = claims.get(target)
+                if claim is None or distance < claim[0]:
+                    claims[target] = (distance, predator)
+        self.resolve_hunts(claims)
+        
+        stats.predator_energy.begin_pass()
+        for predator in predators:
+            if predator.is_alive():
+                stats.predator_energy.observe(predator.energy)
+            else:
+                predators.kill(predator)
+                stats.predator_died(predator)
+        preys.commit()
+        predators.commit()
+        if profiler:
+            start = profiler.mark('predator_hunt', start)
+        
+        # If no predators for 300 ticks, spawn 3 new ones
+        if len(predators) == 0 and self.respawn_predators:
+            if self.predator_extinction_tick is None:
+                self.predator_extinction_tick = self.tick_count  # Record when predators went extinct
+                if self.verbose:
+                    print(f"  Predators went extinct at tick {self.tick_count}")
+            
+            # Check if 300 ticks have passed since extinction
+            if self.tick_count - self.predator_extinction_tick >= 300:
+                if self.verbose:
+                    print(f"  Respawning 3 predators at tick {self.tick_count}")
+                for i in range(3):
+                    predator = self.new_predator(spawning.randint(50, world.width-50), 
+                                                 spawning.randint(50, world.height-50))
+                    predators.spawn(predator)
+                    stats.predator_born(predator)
+                predators.commit()
+                self.predator_extinction_tick = None  # Reset for potential future extinctions
+        else:
+            self.predator_extinction_tick = None  # Reset if predators exist
+        
+        # Add resources if needed - MORE FREQUENT RESOURCE SPAWNING
+        self.tick_count += 1
+        if self.tick_count % 25 == 0 and len(resources) < self.max_resources:
+            resource = self.new_resource()
+            resources.append(resource)
+            food_index.insert(resource)
+            stats.resource_added(resource)
+        if profiler:
+            profiler.mark('respawn', start)
+    
+    def resolve_hunts(self, claims):
+        """Apply one tick's successful hunts, {prey: (distance, predator)}
+        
+        When several predators catch the same prey, the closest one gets it
+        (the first in update order on an exact tie); the others go without.
+        Which predator eats does not depend on whether it was updated before
+        or after its rivals, and the prey are removed in bulk afterwards.
+        """
+        preys, prey_index, stats = self.preys, self.prey_index, self.stats
+        for prey, (_, predator) in claims.items():
+            old_energy = predator.energy
+            predator.feed()
+            stats.predator_updated(predator, old_energy)
+            preys.kill(prey)
+            prey_index.remove(prey)
+            stats.prey_died(prey, killed=True)
+    
+    def sample(self, parameters_changed):
+        """Collect one row of run data for the current tick"""
+        stats = self.stats
+        stats.recount_learning(self.preys)  # Samples carry the exact mean, not the running one
+        return {
+            'tick': self.tick_count,
+            'prey_count': stats.prey_count,
+            'predator_count': stats.predator_count,
+            'resource_count': stats.food_count,
+            'avg_learning': round(stats.avg_learning, 3),
+            'total_prey_eaten': stats.total_prey_eaten,
+            'predators_respawned': 1 if self.predator_extinction_tick and self.tick_count - self.predator_extinction_tick >= 300 else 0,
+            'parameters_changed': parameters_changed
+        }
+
+def run_loop(sim, max_ticks, parameters_changed, renderer=None, sink=None, checkpointer=None, profiler=None):
+    """Step sim until max_ticks, extinction or the window closes
+    
+    A renderer draws (and is polled for window events) once per frame, i.e.
+    every renderer.speed ticks, plus the final state. The 50-tick samples
+    stream into sink as they are taken; without a sink they are collected
+    and returned instead. A checkpointer (see checkpoint.Checkpointer) is
+    given the state after every tick. A profiler (profiling.TickProfiler)
+    times every phase of every tick.
+    """
+    run_data = []
+    if profiler:
+        profiler.attach(sim)
+    
+    running = True
+    try:
+        while running and sim.tick_count < max_ticks and sim.is_active():
+            frame = renderer and renderer.frame_due(sim.tick_count + 1)
+            if profiler:
+                start = profiler.clock()
+            if frame and not renderer.poll_events():
+                running = False
+            if profiler and frame:
+                profiler.mark('events', start)
+            
+            sim.step()
+            
+            # Collect data every 50 ticks
+            if profiler:
+                start = profiler.clock()
+            if sim.tick_count % 50 == 0:
+                if sink:
+                    sink.write(sim.sample(parameters_changed))
+                else:
+                    run_data.append(sim.sample(parameters_changed))
+                if profiler:
+                    start = profiler.mark('metrics', start)
+            
+            if checkpointer and checkpointer.after_tick(sim):
+                if profiler:
+                    start = profiler.mark('checkpoint', start)
+            
+            if frame:
+                renderer.render(sim)
+                if profiler:
+                    profiler.mark('rendering', start)
+            if profiler:
+                profiler.end_tick(sim)
+        if renderer and running and not renderer.frame_due(sim.tick_count):
+            renderer.render(sim)  # Show the final state
+    finally:
+        if profiler:
+            profiler.detach(sim)
+    
+    return run_data
+
+def run_simulation(run_number, description, initial_prey=50, initial_predators=10, 
+                  initial_resources=150, max_resources=300, max_ticks=2000, headless=False, fps=30,
+                  parameters=None, seed=None, sink=None, checkpoint_every=None, checkpoint_dir="checkpoints",
+                  state=None, profile=False, speed=1, width=None, height=None, wrap=False):
+    """Run one simulation and save results to a numbered CSV file
+    
+    With headless=True nothing is drawn, no display is needed and the loop
+    runs as fast as it can instead of being capped at fps frames per second.
+    Otherwise speed ticks are simulated per drawn frame (fps * speed ticks
+    per second at most).
+    parameters is a config.Parameters with the run's rules (baseline rules
+    by default).
+    The same seed always produces the same CSV. Pass a metrics sink (e.g. a
+    ColumnarSink shared by several runs) to write there instead.
+    
+    With checkpoint_every the full state is saved to checkpoint_dir every
+    that many ticks. state continues an existing Simulation (one loaded from
+    a checkpoint, or a checkpoint.fork branch) instead of starting a new one;
+    the run's CSV then keeps the rows up to the state's tick.
+    
+    profile=True times every phase of every tick, prints the summary table
+    and writes a Chrome trace to profile_run_NNN.json.
+    
+    width, height and wrap set the world (see Simulation); a window only
+    shows its top-left screen_width x screen_height corner.
+    """
+    
+    print(f"Starting Run {run_number:03d}: {description}")
+    
+    if parameters is None:
+        parameters = state.parameters if state is not None else Parameters()
+    
+    if state is None:
+        sim = Simulation(initial_prey, initial_predators, initial_resources, max_resources, parameters, seed=seed,
+                         width=width, height=height, wrap=wrap)
+        print(f"  Seed: {sim.seed}")
+    else:
+        sim = state
+        print(f"  Continuing from tick {sim.tick_count} (seed {sim.seed})")
+    # Describe what differs from the baseline scenario for this run
+    parameters_changed = world_changed(Scenario(run_number, description, initial_prey, initial_predators,
+                                                initial_resources, max_resources, parameters).parameters_changed(),
+                                       sim.world)
+    renderer = None
+    if not headless:
+        from rendering import PygameRenderer
+        renderer = PygameRenderer(fps, speed)
+        renderer.start(run_number, description, parameters_changed, max_ticks)
+    
+    # Stream this run's samples to a numbered CSV file unless given a sink
+    resume_tick = sim.tick_count if state is not None else None
+    run_sink = sink or CSVSink(f"run_{run_number:03d}.csv", resume_tick=resume_tick)
+    metadata = {
+        'run_number': run_number,
+        'description': description,
+        'seed': sim.seed,
+        'parameters_changed': parameters_changed,
+        'parameters': parameters.changes(),
+        **world_metadata(sim.world),
+    }
+    if resume_tick is not None:
+        metadata['resumed_at_tick'] = resume_tick
+    run_sink.start_run(metadata)
+    
+    checkpointer = None
+    if checkpoint_every:
+        checkpointer = Checkpointer(checkpoint_dir, checkpoint_every, run_number, {
+            'description': description,
+            'counts': (initial_prey, initial_predators, initial_resources, max_resources),
+            'max_ticks': max_ticks,
+            'parameters': parameters,
+        }, sink=run_sink)
+    profiler = TickProfiler() if profile else None
+    try:
+        run_loop(sim, max_ticks, parameters_changed, renderer, run_sink, checkpointer, profiler)
+    finally:
+        if sink is None:
+            run_sink.close()
+        else:
+            run_sink.flush()
+    
+    tick_count = sim.tick_count
+    
+    final_prey = len(sim.preys)
+    final_predators = len(sim.predators)
+    print(f"Run {run_number:03d} completed at tick {tick_count}: {final_prey} prey, {final_predators} predators")
+    print(f"Parameters: {parameters_changed}")
+    print(f"Data saved to {run_sink.target}")
+    if profiler:
+        print(profiler.summary_table())
+        profiler.write_chrome_trace(f"profile_run_{run_number:03d}.json")
+        print(f"Trace saved to profile_run_{run_number:03d}.json")
+    
+    return final_prey, final_predators, tick_count, parameters_changed
+
+def resume_simulation(path, headless=False, fps=30, checkpoint_every=None, checkpoint_dir="checkpoints",
+                      profile=False, speed=1):
+    """Continue the run saved in a checkpoint file to its original max_ticks
+    
+    The samples go back into the CSV file or columnar dataset the run was
+    writing to, cut back to what it held when the checkpoint was saved.
+    """
+    sim, metadata = load_checkpoint(path)
+    sink = reopen_sink(metadata['sink'], sim.tick_count) if metadata.get('sink') else None
+    try:
+        return run_simulation(metadata['run_number'], metadata['description'], *metadata['counts'],
+                              max_ticks=metadata['max_ticks'], headless=headless, fps=fps,
+                              parameters=metadata['parameters'], sink=sink, checkpoint_every=checkpoint_every,
+                              checkpoint_dir=checkpoint_dir, state=sim, profile=profile, speed=speed)
+    finally:
+        if sink:
+            sink.close()
+
+def simulate(config=None, seed=None, max_ticks=1000, engine="object", width=None, height=None, wrap=False):
+    """Run one scenario headless and return its results in memory
+    
+    config is a config.Scenario, or a config.Parameters run with the
+    baseline populations (the baseline scenario by default). Nothing is
+    drawn, printed or written to disk, and pygame is never imported, so
+    this is the entry point for notebooks, workers and larger pipelines.
+    engine="array" runs on array_engine.ArrayEcosystem (no wrapped worlds).
+    
+    Returns a dict with the seed, world, final tick and populations and,
+    under 'samples', the 50-tick samples as {column: array.array} (the
+    columns of metrics.SAMPLE_COLUMNS, int64 or float64). The object engine
+    needs no NumPy; np.asarray(column) gives a NumPy array. The same seed
+    gives the same samples as run_simulation.
+    """
+    if not isinstance(config, Scenario):
+        config = Scenario(0, "Baseline", parameters=config or Parameters())
+    if engine == "array":
+        if wrap:
+            raise ValueError("The array engine has no wrapped worlds")
+        from array_engine import ArrayEcosystem
+        sim = ArrayEcosystem(*config.counts, config.parameters, seed=seed,
+                             width=width or screen_width, height=height or screen_height)
+    else:
+        sim = Simulation(*config.counts, config.parameters, seed=seed, verbose=False,
+                         width=width, height=height, wrap=wrap)
+    
+    parameters_changed = world_changed(config.parameters_changed(), sim.world)
+    sink = MemorySink()
+    sink.start_run({'run_number': config.run_number, 'description': config.description, 'seed': sim.seed,
+                    'parameters_changed': parameters_changed, 'parameters': config.parameters.changes(),
+                    **world_metadata(sim.world)})
+    run_loop(sim, max_ticks, parameters_changed, sink=sink)
+    final = sim.sample(parameters_changed)
+    return dict(sink.metadata,
+                final_tick=sim.tick_count,
+                final_prey=int(final['prey_count']),
+                final_predators=int(final['predator_count']),
+                samples=sink.columns())
+
+# Run all 10 simulations 
+def run_all_simulations(headless=False, seed=None, dataset=None, checkpoint_every=None,
+                        checkpoint_dir="checkpoints", profile=False, scenarios=SCENARIOS, speed=1,
+                        width=None, height=None, wrap=False):
+    """Run the scenarios in order; with a base seed every run is reproducible
+    
+    Results go to run_001.csv ... run_010.csv, or into one columnar dataset
+    directory when dataset is given. checkpoint_every saves each run's state
+    to checkpoint_dir at that tick interval. scenarios defaults to the 10
+    built-in ones (see config.load_scenarios for reading them from a file).
+    speed is the number of ticks per drawn frame in visual runs. width,
+    height and wrap set the world of every run (see Simulation).
+    """
+    sink = ColumnarSink(dataset) if dataset else None
+    results = []
+    for scenario in scenarios:
+        run_num, desc = scenario.run_number, scenario.description
+        run_seed_value = run_seed(seed, run_num) if seed is not None else None
+        final_prey, final_pred, final_tick, params = run_simulation(run_num, desc, *scenario.counts, max_ticks=1000,
+                                                                  headless=headless, parameters=scenario.parameters,
+                                                                  seed=run_seed_value, sink=sink,
+                                                                  checkpoint_every=checkpoint_every,
+                                                                  checkpoint_dir=checkpoint_dir,
+                                                                  profile=profile, speed=speed,
+                                                                  width=width, height=height, wrap=wrap)
+        results.append((run_num, desc, final_prey, final_pred, final_tick, params))
+        
+        # Small pause between runs so the last frame stays visible
+        if not headless:
+            time.sleep(1)
+    
+    if sink:
+        sink.close()
+    
+    print("\n" + "="*50)
+    print("ALL SIMULATIONS COMPLETED - SUMMARY")
+    print("="*50)
+    for run_num, desc, prey, pred, tick, params in results:
+        status = "STABLE" if prey > 0 and pred > 0 else "EXTINCT"
+        print(f"Run {run_num:02d} ({desc}): {prey} prey, {pred} predators at tick {tick} - {status}")
+        print(f"  Parameters: {params}")
+
+# Start the simulations
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run all 10 ecosystem scenarios")
+    parser.add_argument("--scenarios", default=None, metavar="FILE",
+                        help="run the scenarios in this TOML/JSON file instead of the built-in 10")
+    parser.add_argument("--headless", action="store_true",
+                        help="skip rendering and the 30 FPS cap (no display needed)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="base seed; the same seed reproduces every run exactly")
+    parser.add_argument("--dataset", default=None,
+                        help="append all runs to this columnar dataset directory instead of run_NNN.csv files")
+    parser.add_argument("--checkpoint-every", type=int, default=None, metavar="TICKS",
+                        help="save each run's full state every TICKS ticks")
+    parser.add_argument("--checkpoint-dir", default="checkpoints")
+    parser.add_argument("--resume", default=None, metavar="CHECKPOINT",
+                        help="continue the single run saved in this checkpoint file")
+    parser.add_argument("--speed", type=int, default=1, metavar="TICKS",
+                        help="ticks simulated per drawn frame (change with +/- while running)")
+    parser.add_argument("--width", type=int, default=None, help=f"world width (default: {screen_width})")
+    parser.add_argument("--height", type=int, default=None, help=f"world height (default: {screen_height})")
+    parser.add_argument("--wrap", action="store_true", help="toroidal world: opposite edges join")
+    parser.add_argument("--profile", action="store_true",
+                        help="print per-phase tick timings and write profile_run_NNN.json traces")
+    args = parser.parse_args()
+    try:
+        World(args.width or screen_width, args.height or screen_height, args.wrap)
+    except ValueError as error:
+        parser.error(str(error))
+    # Run through the imported module so checkpoints pickle ecosystem.Simulation, not __main__'s
+    import ecosystem
+    if args.resume:
+        ecosystem.resume_simulation(args.resume, headless=args.headless, checkpoint_every=args.checkpoint_every,
+                                    checkpoint_dir=args.checkpoint_dir, profile=args.profile, speed=args.speed)
+    else:
+        scenarios = load_scenarios(args.scenarios) if args.scenarios else SCENARIOS
+        ecosystem.run_all_simulations(headless=args.headless, seed=args.seed, dataset=args.dataset,
+                                      checkpoint_every=args.checkpoint_every, checkpoint_dir=args.checkpoint_dir,
+                                      profile=args.profile, scenarios=scenarios, speed=args.speed,
+                                      width=args.width, height=args.height, wrap=args.wrap)
+    if not args.headless:
+        from rendering import close_display
+        close_display()
@@ -0,0 +1,112 @@
+"""Monte Carlo ensembles: many replicates per scenario with confidence bands
+
+All replicates of a scenario run together inside one ArrayEcosystem (see
+its replicates argument), so they share every batched operation instead of
+running as separate loops. At each 50-tick sample the ensemble reports the
+mean and quantiles of prey_count, predator_count and avg_learning across
+replicates, together with extinction probabilities.
+
+    python ensemble.py --replicates 200 --runs 1 4 6
+"""
+import argparse
+import csv
+import time
+
+import numpy as np
+
+from array_engine import ArrayEcosystem
+from ecosystem import SCENARIOS, run_seed
+
+ENSEMBLE_METRICS = ['prey_count', 'predator_count', 'avg_learning']
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+def run_ensemble(initial_prey=50, initial_predators=10, initial_resources=400, max_resources=600,
+                 replicates=100, seed=None, max_ticks=1000, quantiles=DEFAULT_QUANTILES, parameters=None):
+    """Run replicates of one configuration together and summarize every 50-tick sample
+
+    Replicates that die out stay in the ensemble with zero counts. Returns a
+    dict with 'tick' (samples,), and for each metric in ENSEMBLE_METRICS the
+    raw (samples, replicates) array, its 'mean' and its quantile bands
+    (len(quantiles), samples), plus the per-sample extinction probabilities
+    'p_prey_extinct', 'p_predator_extinct' and 'p_extinct' (either one).
+    """
+    sim = ArrayEcosystem(initial_prey, initial_predators, initial_resources, max_resources, parameters,
+                         seed=seed, replicates=replicates)
+    ticks = []
+    samples = {metric: [] for metric in ENSEMBLE_METRICS}
+    while sim.tick_count < max_ticks:
+        sim.step()
+        if sim.tick_count % 50 == 0:
+            sample = sim.replicate_samples()
+            ticks.append(sim.tick_count)
+            for metric in ENSEMBLE_METRICS:
+                samples[metric].append(sample[metric])
+
+    result = {'tick': np.array(ticks), 'replicates': replicates, 'seed': sim.seed,
+              'quantiles': tuple(quantiles)}
+    for metric in ENSEMBLE_METRICS:
+        values = np.array(samples[metric], dtype=np.float64).reshape(len(ticks), replicates)
+        result[metric] = values
+        result[f'{metric}_mean'] = values.mean(axis=1)
+        result[f'{metric}_quantiles'] = np.quantile(values, quantiles, axis=1)
+    prey_extinct = result['prey_count'] == 0
+    predator_extinct = result['predator_count'] == 0
+    result['p_prey_extinct'] = prey_extinct.mean(axis=1)
+    result['p_predator_extinct'] = predator_extinct.mean(axis=1)
+    result['p_extinct'] = (prey_extinct | predator_extinct).mean(axis=1)
+    return result
+
+
+def ensemble_header(quantiles):
+    header = ['Run_Number', 'Description', 'Replicates', 'Tick']
+    for metric in ENSEMBLE_METRICS:
+        header.append(f'{metric}_mean')
+        header.extend(f'{metric}_q{round(q * 100):02d}' for q in quantiles)
+    return header + ['P_Prey_Extinct', 'P_Predator_Extinct', 'P_Extinct']
+
+
+def ensemble_rows(run_number, description, result):
+    for i, tick in enumerate(result['tick']):
+        row = [run_number, description, result['replicates'], int(tick)]
+        for metric in ENSEMBLE_METRICS:
+            row.append(round(float(result[f'{metric}_mean'][i]), 3))
+            row.extend(round(float(value), 3) for value in result[f'{metric}_quantiles'][:, i])
+        row.extend(round(float(result[name][i]), 4) for name in ('p_prey_extinct', 'p_predator_extinct', 'p_extinct'))
+        yield row
+
+
+def run_all_ensembles(run_numbers=None, replicates=100, base_seed=0, max_ticks=1000,
+                      quantiles=DEFAULT_QUANTILES, output="ensemble_results.csv"):
+    """Run an ensemble for each selected scenario and write all bands to one CSV"""
+    scenarios = [scenario for scenario in SCENARIOS if not run_numbers or scenario.run_number in run_numbers]
+    with open(output, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(ensemble_header(quantiles))
+        for scenario in scenarios:
+            run_number, description = scenario.run_number, scenario.description
+            start = time.perf_counter()
+            result = run_ensemble(*scenario.counts, replicates=replicates,
+                                  seed=run_seed(base_seed, run_number), max_ticks=max_ticks,
+                                  quantiles=quantiles, parameters=scenario.parameters)
+            writer.writerows(ensemble_rows(run_number, description, result))
+            file.flush()
+
+            low, high = result['prey_count_quantiles'][[0, -1], -1]
+            print(f"Run {run_number:02d} ({description}): {replicates} replicates in "
+                  f"{time.perf_counter() - start:.1f} s - final prey {result['prey_count_mean'][-1]:.1f} "
+                  f"[{low:.0f}-{high:.0f}], predators {result['predator_count_mean'][-1]:.1f}, "
+                  f"P(EXTINCT) = {result['p_extinct'][-1]:.2f}")
+    print(f"Data saved to {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run Monte Carlo ensembles of the scenarios")
+    parser.add_argument("--replicates", type=int, default=100)
+    parser.add_argument("--runs", type=int, nargs="*", help="scenario run numbers (default: all)")
+    parser.add_argument("--seed", type=int, default=0, help="base seed")
+    parser.add_argument("--max-ticks", type=int, default=1000)
+    parser.add_argument("--quantiles", type=float, nargs="*", default=list(DEFAULT_QUANTILES))
+    parser.add_argument("--output", default="ensemble_results.csv")
+    args = parser.parse_args()
+    run_all_ensembles(args.runs, args.replicates, args.seed, args.max_ticks, args.quantiles, args.output)
@@ -0,0 +1,277 @@
+"""Streaming sinks for the 50-tick run samples
+
+A sink receives samples as the run produces them and writes them to disk in
+batches (by default every 5 samples, i.e. 250 ticks), so a crash loses at
+most one batch and memory use does not grow with run length. Every sink has the same interface:
+
+    sink.start_run(metadata)   # once per run: run_number, description, ...
+    sink.write(sample)         # once per sample from Simulation.sample()
+    sink.close()               # flushes whatever is still buffered
+
+sink.sync() also fsyncs everything written so far and returns where the
+sink stands; reopen_sink() opens it again at that point, which is how a run
+resumed from a checkpoint keeps writing to the same file or dataset.
+
+Each sink names where it writes in sink.target. CSVSink keeps the familiar
+run_NNN.csv layout. ColumnarSink writes an append-only columnar dataset: a
+directory with one binary file per column and the run metadata stored once
+per run in metadata.jsonl. Any number of runs (a whole sweep) can be
+appended to the same dataset. MemorySink keeps one run's samples in memory
+instead (see ecosystem.simulate).
+"""
+import csv
+import json
+import os
+import sys
+from array import array
+
+# Sample fields and their array typecodes, in output order
+SAMPLE_COLUMNS = [
+    ('tick', 'q'),
+    ('prey_count', 'q'),
+    ('predator_count', 'q'),
+    ('resource_count', 'q'),
+    ('avg_learning', 'd'),
+    ('total_prey_eaten', 'q'),
+    ('predators_respawned', 'q'),
+]
+CSV_SAMPLE_HEADER = ['Tick', 'Prey_Count', 'Predator_Count', 'Resource_Count', 'Avg_Learning',
+                     'Total_Prey_Eaten', 'Predators_Respawned']
+
+# (CSV header, metadata key) pairs written in front of the sample columns
+RUN_CSV_COLUMNS = [('Run_Number', 'run_number'), ('Description', 'description')]
+SWEEP_CSV_COLUMNS = RUN_CSV_COLUMNS + [('Replicate', 'replicate'), ('Seed', 'seed')]
+
+TYPECODE_DTYPES = {'q': '<i8', 'd': '<f8'}
+
+
+class CSVSink:
+    """Streams samples to a CSV file, flushing to disk every batch_size rows
+
+    With resume_tick the existing file is kept up to and including that tick
+    (a run continued from a checkpoint), and later rows are dropped, as is
+    a last row cut short by a crash.
+    """
+    def __init__(self, filename, metadata_columns=RUN_CSV_COLUMNS, batch_size=5, resume_tick=None):
+        self.filename = filename
+        self.target = filename
+        self.metadata_columns = metadata_columns
+        self.batch_size = batch_size
+        kept_rows = []
+        if resume_tick is not None and os.path.exists(filename):
+            with open(filename, newline='') as file:
+                rows = list(csv.reader(file))
+            if rows:
+                header = rows[0]
+                tick_column = header.index('Tick')
+                kept_rows = [row for row in rows[1:] if len(row) == len(header) and
+                             row[tick_column].isdigit() and int(row[tick_column]) <= resume_tick]
+        self.file = open(filename, 'w', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow([header for header, _ in metadata_columns] + CSV_SAMPLE_HEADER +
+                             ['Parameters_Changed'])
+        self.writer.writerows(kept_rows)
+        self.prefix = []
+        self.parameters_changed = ''
+        self.pending = 0
+
+    def start_run(self, metadata):
+        self.prefix = [metadata[key] for _, key in self.metadata_columns]
+        self.parameters_changed = metadata.get('parameters_changed', '')
+
+    def write(self, sample):
+        self.writer.writerow(self.prefix + [sample[name] for name, _ in SAMPLE_COLUMNS] +
+                             [self.parameters_changed])
+        self.pending += 1
+        if self.pending >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        self.file.flush()
+        self.pending = 0
+
+    def sync(self):
+        self.flush()
+        os.fsync(self.file.fileno())
+        return {'kind': 'csv', 'target': self.filename, 'metadata_columns': self.metadata_columns}
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ColumnarSink:
+    """Appends samples to a columnar dataset directory in batches of batch_size rows
+
+    Layout: <path>/<column>.bin holds raw little-endian values (int64 or
+    float64, see schema.json), including a run_id column tying each row to
+    its line in <path>/metadata.jsonl. Opening an existing dataset appends
+    to it; run ids continue where the dataset left off. Column files left at
+    different lengths by an interrupted flush are cut back to the rows every
+    column has, so later rows stay aligned.
+    
+    resume (a sync() result) cuts the dataset back to the rows and runs it
+    held at that sync; the next start_run then takes over the interrupted
+    run's id and rewrites its metadata line.
+    """
+    def __init__(self, path, batch_size=5, resume=None):
+        self.path = path
+        self.target = path
+        self.batch_size = batch_size
+        os.makedirs(path, exist_ok=True)
+        self.columns = [('run_id', 'q')] + SAMPLE_COLUMNS
+        self.truncate_to_complete_rows(resume and resume['rows'])
+        with open(os.path.join(path, 'schema.json'), 'w') as file:
+            json.dump({name: TYPECODE_DTYPES[code] for name, code in self.columns}, file, indent=2)
+
+        self.metadata_file = open(os.path.join(path, 'metadata.jsonl'), 'a+')
+        self.metadata_file.seek(0)
+        lines = [line for line in self.metadata_file if line.strip()]
+        if resume:
+            lines = lines[:resume['run_id']]
+            self.metadata_file.seek(0)
+            self.metadata_file.truncate()
+            self.metadata_file.writelines(lines)
+            self.metadata_file.flush()
+        self.next_run_id = len(lines)
+        self.run_id = None
+        self.buffers = {name: array(code) for name, code in self.columns}
+
+    def column_filenames(self):
+        return [os.path.join(self.path, f"{name}.bin") for name, _ in self.columns]
+
+    def truncate_to_complete_rows(self, rows=None):
+        filenames = self.column_filenames()
+        sizes = [os.path.getsize(filename) if os.path.exists(filename) else 0 for filename in filenames]
+        complete = min(size // 8 for size in sizes)  # Every column is 8 bytes per row
+        rows = complete if rows is None else min(rows, complete)
+        for filename, size in zip(filenames, sizes):
+            if size > rows * 8:
+                with open(filename, 'r+b') as file:
+                    file.truncate(rows * 8)
+
+    def start_run(self, metadata):
+        self.run_id = self.next_run_id
+        self.next_run_id += 1
+        self.metadata_file.write(json.dumps(dict(metadata, run_id=self.run_id)) + '\n')
+        self.metadata_file.flush()
+
+    def write(self, sample):
+        buffers = self.buffers
+        buffers['run_id'].append(self.run_id)
+        for name, _ in SAMPLE_COLUMNS:
+            buffers[name].append(sample[name])
+        if len(buffers['run_id']) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not len(self.buffers['run_id']):
+            return
+        for name, code in self.columns:
+            values = self.buffers[name]
+            if sys.byteorder == 'big':
+                values.byteswap()
+            with open(os.path.join(self.path, f"{name}.bin"), 'ab') as file:
+                values.tofile(file)
+            self.buffers[name] = array(code)
+
+    def sync(self):
+        self.flush()
+        for filename in self.column_filenames():
+            if os.path.exists(filename):
+                with open(filename, 'ab') as file:
+                    os.fsync(file.fileno())
+        self.metadata_file.flush()
+        os.fsync(self.metadata_file.fileno())
+        run_ids = self.column_filenames()[0]
+        rows = os.path.getsize(run_ids) // 8 if os.path.exists(run_ids) else 0
+        return {'kind': 'columnar', 'target': self.path, 'rows': rows, 'run_id': self.run_id}
+
+    def close(self):
+        if not self.metadata_file.closed:
+            self.flush()
+            self.metadata_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class MemorySink:
+    """Keeps the samples of one run in memory as typed columns; writes nothing to disk"""
+    def __init__(self):
+        self.target = "memory"
+        self.metadata = None
+        self.buffers = {name: array(code) for name, code in SAMPLE_COLUMNS}
+
+    def start_run(self, metadata):
+        self.metadata = metadata
+
+    def write(self, sample):
+        for name, _ in SAMPLE_COLUMNS:
+            self.buffers[name].append(sample[name])
+
+    def flush(self):
+        pass
+
+    def sync(self):
+        return None  # Nothing on disk to reopen
+
+    def close(self):
+        pass
+
+    def columns(self):
+        """The samples as {column: array.array}; np.asarray() turns a column into a NumPy array"""
+        return dict(self.buffers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def reopen_sink(state, resume_tick):
+    """Open the sink a sync() result describes again, dropping what it received after that sync"""
+    if state['kind'] == 'columnar':
+        return ColumnarSink(state['target'], resume=state)
+    return CSVSink(state['target'], state['metadata_columns'], resume_tick=resume_tick)
+
+
+def read_dataset(path):
+    """Load a ColumnarSink dataset as ({column: numpy array}, [run metadata])
+
+    Columns are cut to the shortest one, so a dataset whose last flush was
+    interrupted still loads.
+    """
+    import numpy as np
+
+    with open(os.path.join(path, 'schema.json')) as file:
+        schema = json.load(file)
+    columns = {}
+    for name, dtype in schema.items():
+        filename = os.path.join(path, f"{name}.bin")
+        columns[name] = np.fromfile(filename, dtype=dtype) if os.path.exists(filename) else np.empty(0, dtype)
+    rows = min(len(values) for values in columns.values())
+    columns = {name: values[:rows] for name, values in columns.items()}
+
+    with open(os.path.join(path, 'metadata.jsonl')) as file:
+        runs = [json.loads(line) for line in file if line.strip()]
+    return columns, runs
+
+
+def export_npz(path, filename):
+    """Pack a columnar dataset into one compressed .npz (metadata as a JSON string)"""
+    import numpy as np
+
+    columns, runs = read_dataset(path)
+    np.savez_compressed(filename, metadata=np.array(json.dumps(runs)), **columns)
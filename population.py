@@ -0,0 +1,54 @@
+class Population:
+    """Ordered collection of agents with O(1) kill and spawn
+
+    kill() only leaves a hole at the agent's slot and spawn() only queues
+    the newcomer; commit() applies both in a single pass at the end of a
+    phase. The tick loop can therefore iterate the population directly
+    (holes are skipped, newcomers are not visited until committed) instead
+    of iterating a copy and removing agents from the middle of a list.
+    Survivors keep their order, so seeded runs are unchanged.
+    """
+    def __init__(self, agents=()):
+        self.slots = []  # Agents in update order, None where one was killed
+        self.slot_of = {}  # agent -> index in slots
+        self.born = []  # Spawned this phase, appended by commit()
+        self.holes = 0
+        self.operations = 0  # List operations, read by profiling.TickProfiler
+        for agent in agents:
+            self.slot_of[agent] = len(self.slots)
+            self.slots.append(agent)
+
+    def __len__(self):
+        return len(self.slots) - self.holes
+
+    def __iter__(self):
+        for agent in self.slots:
+            if agent is not None:
+                yield agent
+
+    def __contains__(self, agent):
+        return agent in self.slot_of
+
+    def spawn(self, agent):
+        self.born.append(agent)
+        self.operations += 1
+
+    def kill(self, agent):
+        self.slots[self.slot_of.pop(agent)] = None
+        self.holes += 1
+        self.operations += 1
+
+    def commit(self):
+        """Close the holes left by kill() and add the agents from spawn()"""
+        slots = self.slots
+        if self.holes:
+            self.operations += len(slots)  # One pass over every slot
+            slots = self.slots = [agent for agent in slots if agent is not None]
+            self.slot_of = {agent: i for i, agent in enumerate(slots)}
+            self.holes = 0
+        if self.born:
+            slot_of = self.slot_of
+            for agent in self.born:
+                slot_of[agent] = len(slots)
+                slots.append(agent)
+            self.born = []
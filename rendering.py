@@ -0,0 +1,145 @@
+"""Pygame window and renderer for visual runs
+
+Only imported when a run is drawn, so headless runs, workers and library
+use of ecosystem (see ecosystem.simulate) never load pygame or open a
+window.
+"""
+import pygame
+
+from ecosystem import screen_width, screen_height
+
+# Colors
+GREEN = (0, 255, 0)
+RED = (255, 0, 0)
+BROWN = (139, 69, 19)
+DARK_GREEN = (0, 100, 0)
+WHITE = (255, 255, 255)
+
+SPRITE_KEY = (255, 0, 255)  # Transparent sprite background, a color no agent uses
+
+MAX_SPEED = 256  # Most ticks simulated per drawn frame
+
+screen = None  # Opened by init_display() on the first visual run
+
+def init_display():
+    """Initialize pygame and open the simulation window"""
+    global screen
+    if screen is None:
+        pygame.init()
+        screen = pygame.display.set_mode((screen_width, screen_height))
+        pygame.display.set_caption("Ecosystem Simulation - 10 Runs")
+    return screen
+
+def close_display():
+    global screen
+    screen = None
+    pygame.quit()
+
+def circle_sprite(color, radius):
+    """Prebuilt circle to blit instead of drawing one circle per agent"""
+    sprite = pygame.Surface((2 * radius, 2 * radius)).convert()
+    sprite.fill(SPRITE_KEY)
+    sprite.set_colorkey(SPRITE_KEY)
+    pygame.draw.circle(sprite, color, (radius, radius), radius)
+    return sprite
+
+class PygameRenderer:
+    """Optional observer that draws the world at a capped frame rate
+    
+    speed is the number of ticks simulated per drawn frame, so a run can be
+    watched at several times the frame rate; +/- or the arrow keys double
+    or halve it while running. The font, text lines and agent sprites are
+    built once and reused, and agents are drawn in one blits() call.
+    """
+    TEXT_CACHE_SIZE = 256
+    
+    def __init__(self, fps=30, speed=1):
+        self.fps = fps
+        self.speed = max(1, speed)
+        self.screen = init_display()
+        self.clock = pygame.time.Clock()
+        self.font = pygame.font.Font(None, 24)
+        self.text_cache = {}  # line -> rendered text surface
+        self.prey_sprites = {}  # green value -> sprite, built as learning levels appear
+        self.predator_sprite = circle_sprite(RED, 6)
+        self.food_sprite = circle_sprite(DARK_GREEN, 3)
+        self.empty_sprite = circle_sprite(BROWN, 2)
+        
+    def start(self, run_number, description, parameters_changed, max_ticks):
+        self.run_number = run_number
+        self.description = description
+        self.parameters_changed = parameters_changed
+        self.max_ticks = max_ticks
+        # Update window title
+        pygame.display.set_caption(f"Ecosystem Simulation - Run {run_number:03d}")
+    
+    def frame_due(self, tick):
+        """Whether the frame for this tick is drawn (every speed-th tick)"""
+        return tick % self.speed == 0
+        
+    def poll_events(self):
+        """Returns False once the window has been closed"""
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return False
+            if event.type == pygame.KEYDOWN:
+                if event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS, pygame.K_UP):
+                    self.speed = min(self.speed * 2, MAX_SPEED)
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS, pygame.K_DOWN):
+                    self.speed = max(self.speed // 2, 1)
+        return True
+    
+    def text(self, line):
+        surface = self.text_cache.get(line)
+        if surface is None:
+            # Tick and count lines change every frame; forget them now and then
+            if len(self.text_cache) >= self.TEXT_CACHE_SIZE:
+                self.text_cache.clear()
+            surface = self.text_cache[line] = self.font.render(line, True, WHITE)
+        return surface
+    
+    def prey_sprite(self, learning_level):
+        # Color shows learning level (darker green = more learned)
+        green_value = int(255 * (1 - learning_level * 0.5))
+        sprite = self.prey_sprites.get(green_value)
+        if sprite is None:
+            sprite = self.prey_sprites[green_value] = circle_sprite((0, green_value, 0), 4)
+        return sprite
+        
+    def render(self, sim):
+        # Clear screen
+        self.screen.fill((50, 120, 80))
+        
+        food, empty = self.food_sprite, self.empty_sprite
+        prey_sprite, predator = self.prey_sprite, self.predator_sprite
+        sprites = [(food, (int(resource.x) - 3, int(resource.y) - 3)) if resource.has_food
+                   else (empty, (int(resource.x) - 2, int(resource.y) - 2)) for resource in sim.resources]
+        sprites += [(prey_sprite(prey.learning_level), (int(prey.x) - 4, int(prey.y) - 4)) for prey in sim.preys]
+        sprites += [(predator, (int(hunter.x) - 6, int(hunter.y) - 6)) for hunter in sim.predators]
+        self.screen.blits(sprites, doreturn=False)
+        
+        # Display stats
+        stats = sim.stats
+        
+        # Show predator respawn status
+        predator_status = f"Predators: {stats.predator_count}"
+        if sim.predator_extinction_tick is not None:
+            ticks_since_extinction = sim.tick_count - sim.predator_extinction_tick
+            predator_status = f"Predators: 0 (Respawning in {300-ticks_since_extinction} ticks)"
+        
+        parameters_changed = self.parameters_changed
+        speed = f" ({self.speed}x)" if self.speed > 1 else ""
+        stats = [
+            f"Run {self.run_number:03d}: {self.description}",
+            f"Tick: {sim.tick_count}/{self.max_ticks}{speed}",
+            f"Prey: {stats.prey_count}",
+            predator_status,
+            f"Food: {stats.food_count}",
+            f"Avg Learning: {stats.avg_learning:.2f}",
+            f"Params: {parameters_changed[:30]}..." if len(parameters_changed) > 30 else f"Params: {parameters_changed}"
+        ]
+        self.screen.blits([(self.text(stat), (10, 10 + i * 25)) for i, stat in enumerate(stats)], doreturn=False)
+        
+        pygame.display.flip()
+        if self.fps:
+            self.clock.tick(self.fps)
@@ -0,0 +1,379 @@
+"""Parameter sensitivity sweeps that map the stability / extinction frontier
+
+A sweep explores ranges of the scenario counts (initial_prey,
+initial_predators, initial_resources, max_resources) and of any
+config.Parameters field (metabolism, hunt_probability, vision, ...).
+
+1. An initial Latin hypercube design spreads --samples points over the
+   ranges, one point per stratum of every parameter.
+2. Every point runs --replicates seeds and gets P(coexist), the share of
+   runs that still have prey and predators at the end. Points are STABLE
+   (all runs coexist), EXTINCT (none) or MIXED.
+3. Each refinement round pairs every point with its nearest neighbour of
+   the opposite outcome and samples between them, widest gaps first, so
+   new points land on the frontier instead of deep inside a stable or
+   extinct region. Rounds stop early once all gaps are below --resolution.
+
+Every finished run is appended to a cache keyed by a hash of its
+populations, full parameters, seed, tick limit, engine and
+config.RULES_VERSION (so outcomes from older rules are never reused). A
+repeated or extended sweep (more rounds, more replicates, other ranges
+that revisit a point) only runs what is missing. Replicate r uses the same seed at every
+point, so neighbouring points differ by their parameters, not their luck.
+
+    python sensitivity.py --samples 40 --rounds 3 --refine 20 --engine array
+    python sensitivity.py --parameters predator_metabolism hunt_probability \\
+        --range hunt_probability 0.3 1.0 --replicates 8
+"""
+import argparse
+import csv
+import dataclasses
+import hashlib
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import ecosystem
+from config import Parameters, SCENARIOS, RULES_VERSION
+from ecosystem import run_seed
+
+COUNT_NAMES = ['initial_prey', 'initial_predators', 'initial_resources', 'max_resources']
+INTEGER_NAMES = set(COUNT_NAMES) | {spec.name for spec in dataclasses.fields(Parameters) if spec.type is int}
+
+DEFAULT_RANGES = {
+    'initial_prey': (10, 150),
+    'initial_predators': (1, 40),
+    'initial_resources': (100, 800),
+    'max_resources': (150, 1200),
+    'prey_metabolism': (0.2, 2.0),
+    'predator_metabolism': (0.4, 4.0),
+    'hunt_probability': (0.2, 1.0),
+    'prey_vision': (50, 250),
+    'predator_vision': (50, 300),
+}
+
+
+def latin_hypercube(count, dimensions, rng):
+    """count points in the unit cube, exactly one per 1/count stratum of every dimension"""
+    columns = []
+    for _ in range(dimensions):
+        strata = list(range(count))
+        rng.shuffle(strata)
+        columns.append([(stratum + rng.random()) / count for stratum in strata])
+    return [list(point) for point in zip(*columns)]
+
+
+class ParameterSpace:
+    """Maps points of the unit cube to scenario settings and back"""
+    def __init__(self, ranges, base=SCENARIOS[0]):
+        fields = set(COUNT_NAMES) | {spec.name for spec in dataclasses.fields(Parameters)}
+        unknown = set(ranges) - fields
+        if unknown:
+            raise ValueError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+        for name, (low, high) in ranges.items():
+            if low > high:
+                raise ValueError(f"{name}: low ({low}) is larger than high ({high})")
+        self.names = list(ranges)
+        self.ranges = ranges
+        self.base = base
+
+    def values(self, unit):
+        """{name: value} at a unit-cube point, integers rounded"""
+        values = {}
+        for name, u in zip(self.names, unit):
+            low, high = self.ranges[name]
+            value = low + u * (high - low)
+            values[name] = round(value) if name in INTEGER_NAMES else round(value, 6)
+        return values
+
+    def unit(self, values):
+        """Unit-cube coordinates of {name: value} (inverse of values())"""
+        return [(values[name] - low) / (high - low) if high > low else 0.5
+                for name, (low, high) in ((name, self.ranges[name]) for name in self.names)]
+
+    def scenario(self, values):
+        """Scenario for a point; raises ValueError for invalid combinations"""
+        counts = {name: value for name, value in values.items() if name in COUNT_NAMES}
+        rules = {name: value for name, value in values.items() if name not in COUNT_NAMES}
+        return dataclasses.replace(self.base, description="Sensitivity point",
+                                   parameters=self.base.parameters.replace(**rules), **counts)
+
+
+def run_key(scenario, seed, max_ticks, engine):
+    """Cache key of one run: everything that determines its outcome"""
+    settings = {'counts': scenario.counts, 'parameters': dataclasses.asdict(scenario.parameters),
+                'seed': seed, 'max_ticks': max_ticks, 'engine': engine, 'rules_version': RULES_VERSION}
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()
+
+
+class RunCache:
+    """Outcomes of finished runs, appended to a JSON-lines file as they finish"""
+    def __init__(self, path):
+        self.path = path
+        self.outcomes = {}
+        if path and os.path.exists(path):
+            with open(path) as file:
+                for line in file:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.outcomes[entry['key']] = entry
+
+    def __contains__(self, key):
+        return key in self.outcomes
+
+    def __getitem__(self, key):
+        return self.outcomes[key]
+
+    def add(self, entry):
+        self.outcomes[entry['key']] = entry
+        if self.path:
+            with open(self.path, 'a') as file:
+                file.write(json.dumps(entry) + "\n")
+
+
+def run_outcome(job):
+    """Run one replicate of one point headless and return its final state (runs inside a worker)"""
+    result = ecosystem.simulate(job['scenario'], job['seed'], job['max_ticks'], job['engine'])
+    return {
+        'key': job['key'],
+        'final_prey': result['final_prey'],
+        'final_predators': result['final_predators'],
+        'final_tick': result['final_tick'],
+    }
+
+
+def summarize(point, outcomes):
+    coexist = [outcome['final_prey'] > 0 and outcome['final_predators'] > 0 for outcome in outcomes]
+    p_coexist = sum(coexist) / len(coexist)
+    point.update({
+        'replicates': len(outcomes),
+        'p_coexist': p_coexist,
+        'status': "STABLE" if p_coexist == 1 else "EXTINCT" if p_coexist == 0 else "MIXED",
+        'mean_final_prey': sum(outcome['final_prey'] for outcome in outcomes) / len(outcomes),
+        'mean_final_predators': sum(outcome['final_predators'] for outcome in outcomes) / len(outcomes),
+        'mean_final_tick': sum(outcome['final_tick'] for outcome in outcomes) / len(outcomes),
+    })
+    return point
+
+
+def distance(a, b):
+    return math.sqrt(sum((x - y) ** 2 for x, y in zip(a, b)))
+
+
+def frontier_gaps(points):
+    """(gap, point, neighbour) for each point and its nearest neighbour with another outcome
+
+    MIXED points sit on the frontier themselves and pair with their nearest
+    STABLE or EXTINCT neighbour. A pair only counts while no other point lies
+    inside the sphere spanned by the two (they are Gabriel neighbours), so a
+    gap that an earlier round already split is not split again. Each pair is
+    listed once, widest first.
+    """
+    gaps = {}
+    for i, point in enumerate(points):
+        candidates = [j for j, other in enumerate(points) if other['status'] != point['status']]
+        if not candidates:
+            continue
+        j = min(candidates, key=lambda j: distance(point['unit'], points[j]['unit']))
+        pair = (min(i, j), max(i, j))
+        if pair in gaps:
+            continue
+        gap = distance(point['unit'], points[j]['unit'])
+        middle = [(a + b) / 2 for a, b in zip(point['unit'], points[j]['unit'])]
+        if not any(distance(other['unit'], middle) < gap / 2 for k, other in enumerate(points) if k not in pair):
+            gaps[pair] = gap
+    return sorted(((gap, points[i], points[j]) for (i, j), gap in gaps.items()), key=lambda item: -item[0])
+
+
+def rank(values):
+    """Ranks with ties averaged, for Spearman correlation"""
+    order = sorted(range(len(values)), key=lambda i: values[i])
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2
+        i = j + 1
+    return ranks
+
+
+def spearman(xs, ys):
+    rx, ry = rank(xs), rank(ys)
+    mean_x, mean_y = sum(rx) / len(rx), sum(ry) / len(ry)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in zip(rx, ry))
+    spread = math.sqrt(sum((x - mean_x) ** 2 for x in rx) * sum((y - mean_y) ** 2 for y in ry))
+    return covariance / spread if spread else 0.0
+
+
+def sensitivity(points, names):
+    """{name: Spearman correlation with P(coexist)} over the initial design
+
+    Only round-0 points are used: refinement points crowd the frontier and
+    would bias the correlations.
+    """
+    design = [point for point in points if point['round'] == 0]
+    if len(design) < 3:
+        return {}
+    p_coexist = [point['p_coexist'] for point in design]
+    return {name: spearman([point['values'][name] for point in design], p_coexist) for name in names}
+
+
+class SensitivitySweep:
+    """Latin hypercube design plus frontier refinement, with cached runs"""
+    def __init__(self, ranges=DEFAULT_RANGES, replicates=4, base_seed=0, max_ticks=1000, engine="object",
+                 workers=None, cache="sensitivity_cache.jsonl", base=SCENARIOS[0]):
+        self.space = ParameterSpace(ranges, base)
+        self.replicates = replicates
+        self.base_seed = base_seed
+        self.max_ticks = max_ticks
+        self.engine = engine
+        self.workers = workers or os.cpu_count() or 1
+        self.cache = RunCache(cache)
+        self.rng = random.Random(f"sensitivity:{base_seed}")
+        self.points = []
+        self.seen = set()  # Points already in the sweep, by their rounded values
+        self.runs = 0
+        self.cached = 0
+        self.skipped = 0
+
+    def add_points(self, units, round_number):
+        """Evaluate new unit-cube points (duplicates and invalid combinations are dropped)"""
+        points = []
+        jobs = []
+        pending = set()
+        for unit in units:
+            values = self.space.values(unit)
+            identity = tuple(values[name] for name in self.space.names)
+            if identity in self.seen:
+                continue
+            self.seen.add(identity)
+            try:
+                scenario = self.space.scenario(values)
+            except ValueError:
+                self.skipped += 1
+                continue
+            keys = []
+            for replicate in range(self.replicates):
+                seed = run_seed(self.base_seed, 0, replicate)
+                key = run_key(scenario, seed, self.max_ticks, self.engine)
+                keys.append(key)
+                if key not in self.cache and key not in pending:
+                    pending.add(key)
+                    jobs.append({'key': key, 'scenario': scenario, 'seed': seed,
+                                 'max_ticks': self.max_ticks, 'engine': self.engine})
+            points.append({'point': len(self.points) + len(points), 'round': round_number,
+                           'values': values, 'unit': self.space.unit(values), 'keys': keys})
+
+        self.cached += len(points) * self.replicates - len(jobs)
+        self.runs += len(jobs)
+        if self.workers == 1 or len(jobs) < 2:
+            for job in jobs:
+                self.cache.add(run_outcome(job))
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                for outcome in pool.map(run_outcome, jobs, chunksize=1):
+                    self.cache.add(outcome)
+
+        for point in points:
+            summarize(point, [self.cache[key] for key in point['keys']])
+        self.points.extend(points)
+        return points
+
+    def refinement(self, count, resolution):
+        """Up to count new unit points between opposite-outcome neighbours, widest gaps first"""
+        units = []
+        for gap, point, neighbour in frontier_gaps(self.points):
+            if len(units) >= count or gap < resolution:
+                break
+            # Midpoint, jittered so repeated bisections do not all fall on one line
+            jitter = gap / 4
+            units.append([min(1.0, max(0.0, (a + b) / 2 + self.rng.gauss(0, jitter)))
+                          for a, b in zip(point['unit'], neighbour['unit'])])
+        return units
+
+    def run(self, samples=40, rounds=3, refine=20, resolution=0.02):
+        start = time.perf_counter()
+        self.add_points(latin_hypercube(samples, len(self.space.names), self.rng), 0)
+        self.report(0)
+        for round_number in range(1, rounds + 1):
+            units = self.refinement(refine, resolution)
+            if not units:
+                print(f"Frontier resolved below {resolution} - stopping after round {round_number - 1}")
+                break
+            self.add_points(units, round_number)
+            self.report(round_number)
+        print(f"{len(self.points)} points, {self.runs} runs in {time.perf_counter() - start:.1f} s "
+              f"({self.cached} taken from the cache, {self.skipped} invalid points skipped)")
+        return self.points
+
+    def report(self, round_number):
+        points = [point for point in self.points if point['round'] == round_number]
+        counts = {status: sum(point['status'] == status for point in points)
+                  for status in ("STABLE", "MIXED", "EXTINCT")}
+        gaps = frontier_gaps(self.points)
+        widest = f"{gaps[0][0]:.3f}" if gaps else "-"
+        print(f"Round {round_number}: {len(points)} points ({counts['STABLE']} stable, {counts['MIXED']} mixed, "
+              f"{counts['EXTINCT']} extinct), {len(gaps)} frontier pairs, widest gap {widest}")
+
+    def write_csv(self, output):
+        names = self.space.names
+        with open(output, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['Point', 'Round', *names, 'Replicates', 'P_Coexist', 'Status',
+                             'Mean_Final_Prey', 'Mean_Final_Predators', 'Mean_Final_Tick'])
+            for point in self.points:
+                writer.writerow([point['point'], point['round'], *(point['values'][name] for name in names),
+                                 point['replicates'], round(point['p_coexist'], 3), point['status'],
+                                 round(point['mean_final_prey'], 1), round(point['mean_final_predators'], 1),
+                                 round(point['mean_final_tick'], 1)])
+        print(f"Data saved to {output}")
+
+    def sensitivity_table(self):
+        correlations = sensitivity(self.points, self.space.names)
+        lines = [f"{'parameter':<22} {'range':>17} {'rho(P_coexist)':>15}"]
+        for name, rho in sorted(correlations.items(), key=lambda item: -abs(item[1])):
+            low, high = self.space.ranges[name]
+            lines.append(f"{name:<22} {f'{low:g}-{high:g}':>17} {rho:>+15.2f}")
+        return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Map the stability / extinction frontier of the parameters")
+    parser.add_argument("--parameters", nargs="*", default=list(DEFAULT_RANGES), metavar="NAME",
+                        help="parameters to sweep (default: all with a default range)")
+    parser.add_argument("--range", nargs=3, action="append", default=[], metavar=("NAME", "LOW", "HIGH"),
+                        help="range of a parameter (repeatable); adds it to the sweep")
+    parser.add_argument("--samples", type=int, default=40, help="points in the initial Latin hypercube")
+    parser.add_argument("--rounds", type=int, default=3, help="frontier refinement rounds")
+    parser.add_argument("--refine", type=int, default=20, help="new points per refinement round")
+    parser.add_argument("--resolution", type=float, default=0.02,
+                        help="stop refining gaps narrower than this (unit-cube distance)")
+    parser.add_argument("--replicates", type=int, default=4, help="seeds per point")
+    parser.add_argument("--seed", type=int, default=0, help="base seed for the design and the replicates")
+    parser.add_argument("--max-ticks", type=int, default=1000)
+    parser.add_argument("--engine", choices=["object", "array"], default="object")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (default: all cores)")
+    parser.add_argument("--cache", default="sensitivity_cache.jsonl", help="run cache file ('' to disable)")
+    parser.add_argument("--output", default="sensitivity_results.csv")
+    args = parser.parse_args()
+
+    ranges = {name: DEFAULT_RANGES[name] for name in args.parameters if name in DEFAULT_RANGES}
+    missing = [name for name in args.parameters if name not in DEFAULT_RANGES]
+    for name, low, high in args.range:
+        ranges[name] = (float(low), float(high))
+        if name in missing:
+            missing.remove(name)
+    if missing:
+        parser.error(f"no default range for {', '.join(missing)}; give one with --range")
+
+    sweep = SensitivitySweep(ranges, args.replicates, args.seed, args.max_ticks, args.engine, args.workers,
+                             args.cache or None)
+    sweep.run(args.samples, args.rounds, args.refine, args.resolution)
+    sweep.write_csv(args.output)
+    print(sweep.sensitivity_table())
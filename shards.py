@@ -0,0 +1,344 @@
+"""One large world split into vertical strips (shards), each stepped on its own core
+
+ShardedSimulation runs a single ecosystem over a world of any size. The
+world is cut into equal strips along x. Each shard is an ordinary
+Simulation that owns the agents inside its strip and runs in its own
+worker process. Every tick:
+
+1. Each shard receives its halo: the positions of prey and food that lie
+   within search reach (the furthest prey or predator vision) of its
+   edges in the neighbouring shards. The wrapped-around neighbour counts
+   too in a toroidal world. Halo agents are Ghost copies that local agents
+   see and chase as usual.
+2. Each shard steps its own agents.
+3. Agents that left the strip migrate to the shard that now owns them,
+   and every shard sends its new border agents as the next halo.
+
+Eating and killing only happen between agents of the same shard. A prey
+or predator chasing a target across a border catches it once it has
+crossed and been handed over, a tick or two later. World-wide rules
+(a new food patch every 25 ticks up to max_resources, and predator
+respawn after 300 ticks of extinction) are applied by the coordinator for
+the whole world. The initial populations are the ones a single Simulation
+with the same seed would create.
+
+    python shards.py --width 3200 --height 2400 --shards 4 --wrap --max-ticks 500
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import time
+
+import ecosystem
+from config import Parameters, Scenario
+from spatial import World
+from metrics import CSVSink, RUN_CSV_COLUMNS
+
+
+class Ghost:
+    """Read-only copy of a prey or food patch owned by a neighbouring shard"""
+    __slots__ = ('x', 'y')
+    owned = False
+    has_food = True
+    serial = -1  # Ghosts win distance ties; between two ghosts the cell order decides
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class Shard:
+    """One strip [left, right) of the world with the agents it owns"""
+    def __init__(self, left, right, halo, sim):
+        self.left = left
+        self.right = right
+        self.halo = halo
+        self.sim = sim
+        self.border_food = []  # Patches near an edge; patches never move
+
+    def adopt(self, preys=(), predators=(), resources=(), born_predators=()):
+        self.sim.add_agents(preys, predators, resources)
+        if born_predators:
+            self.sim.add_agents(predators=born_predators, born=True)
+        self.border_food += [resource for resource in resources
+                             if resource.x < self.left + self.halo or resource.x >= self.right - self.halo]
+
+    def halos(self):
+        """(prey, food) positions near the left edge and near the right edge"""
+        inner_left, inner_right = self.left + self.halo, self.right - self.halo
+        prey = [(agent.x, agent.y) for agent in self.sim.preys]
+        food = [(resource.x, resource.y) for resource in self.border_food if resource.has_food]
+        return ([point for point in prey if point[0] < inner_left], [point for point in food if point[0] < inner_left],
+                [point for point in prey if point[0] >= inner_right], [point for point in food if point[0] >= inner_right])
+
+    def summary(self):
+        stats = self.sim.stats
+        return {
+            'prey_count': stats.prey_count,
+            'predator_count': stats.predator_count,
+            'food_count': stats.food_count,
+            'resource_count': stats.resource_count,
+            'learning_total': stats.learning_total,
+            'total_prey_eaten': stats.total_prey_eaten,
+        }
+
+    def step(self, ghost_prey, ghost_food, preys, predators, resources, born_predators):
+        """Take in migrants and the halo, advance one tick, hand back emigrants and the new halo"""
+        self.adopt(preys, predators, resources, born_predators)
+        sim = self.sim
+        ghosts = [Ghost(x, y) for x, y in ghost_prey]
+        ghost_patches = [Ghost(x, y) for x, y in ghost_food]
+        for ghost in ghosts:
+            sim.prey_index.insert(ghost)
+        for ghost in ghost_patches:
+            sim.food_index.insert(ghost)
+
+        sim.step()
+
+        for ghost in ghosts:
+            sim.prey_index.remove(ghost)
+        for ghost in ghost_patches:
+            sim.food_index.remove(ghost)
+        left, right = self.left, self.right
+        leaving_prey = [prey for prey in sim.preys if not left <= prey.x < right]
+        leaving_predators = [predator for predator in sim.predators if not left <= predator.x < right]
+        sim.remove_agents(leaving_prey, leaving_predators)
+        return {'preys': leaving_prey, 'predators': leaving_predators, 'halos': self.halos(),
+                'summary': self.summary()}
+
+
+def serve_shard(connection, shard):
+    """Worker process: step one shard whenever the coordinator asks"""
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        connection.send(shard.step(*message))
+    connection.close()
+
+
+class ShardedSimulation:
+    """A Simulation-like world stepped as shards in parallel worker processes
+
+    Has step(), sample(), is_active() and tick_count like Simulation, so
+    ecosystem.run_loop can drive it headless. With processes=False the
+    shards run one after the other in this process; the results are the
+    same either way. Call close() to stop the workers.
+    """
+    def __init__(self, initial_prey=50, initial_predators=10, initial_resources=150, max_resources=300,
+                 parameters=None, seed=None, width=None, height=None, wrap=False, shards=None, processes=True,
+                 verbose=True):
+        # Populate the whole world exactly like a single Simulation, then deal the agents out
+        whole = ecosystem.Simulation(initial_prey, initial_predators, initial_resources, max_resources,
+                                     parameters, seed=seed, verbose=False, width=width, height=height, wrap=wrap)
+        self.parameters = parameters = whole.parameters
+        self.world = world = whole.world
+        self.random = whole.random  # World-wide draws: new patches and respawned predators
+        self.seed = whole.seed
+        self.max_resources = max_resources
+        self.verbose = verbose
+        self.tick_count = 0
+        self.predator_extinction_tick = None
+
+        count = shards or os.cpu_count() or 1
+        self.strip = world.width / count
+        halo = parameters.search_reach
+        if count > 1 and self.strip < halo:
+            raise ValueError(f"{count} shards of width {self.strip:.0f} are narrower than the search reach "
+                             f"({halo}); use fewer shards or a wider world")
+        self.shards = []
+        for index in range(count):
+            shard_seed = random.Random(f"{self.seed}:shard:{index}").getrandbits(32)
+            sim = ecosystem.Simulation(0, 0, 0, 0, parameters, seed=shard_seed, verbose=False,
+                                       width=world.width, height=world.height, wrap=wrap)
+            sim.respawn_predators = False  # World-wide rule, applied here
+            right = world.width if index == count - 1 else (index + 1) * self.strip
+            self.shards.append(Shard(index * self.strip, right, halo, sim))
+
+        incoming = self.empty_deliveries()
+        for prey in whole.preys:
+            incoming[self.owner(prey.x)]['preys'].append(prey)
+        for predator in whole.predators:
+            incoming[self.owner(predator.x)]['predators'].append(predator)
+        for resource in whole.resources:
+            incoming[self.owner(resource.x)]['resources'].append(resource)
+        for shard, delivery in zip(self.shards, incoming):
+            shard.adopt(**delivery)
+        self.summaries = [shard.summary() for shard in self.shards]
+        self.ghosts = self.route_halos([shard.halos() for shard in self.shards])
+        self.incoming = self.empty_deliveries()
+
+        self.connections = []
+        self.workers = []
+        if processes and count > 1:
+            for shard in self.shards:
+                parent, child = multiprocessing.Pipe()
+                worker = multiprocessing.Process(target=serve_shard, args=(child, shard), daemon=True)
+                worker.start()
+                child.close()
+                self.connections.append(parent)
+                self.workers.append(worker)
+
+    def empty_deliveries(self):
+        return [{'preys': [], 'predators': [], 'resources': [], 'born_predators': []} for _ in self.shards]
+
+    def owner(self, x):
+        return min(int(x // self.strip), len(self.shards) - 1)
+
+    def neighbours(self, index):
+        """(left, right) neighbour shard indexes, None at the edge of a bounded world"""
+        count = len(self.shards)
+        if count == 1:
+            return None, None
+        wrap = self.world.wrap
+        left = index - 1 if index > 0 else (count - 1 if wrap else None)
+        right = index + 1 if index < count - 1 else (0 if wrap else None)
+        return left, right
+
+    def route_halos(self, halos):
+        """Per shard: the (prey, food) ghost positions its neighbours sent it"""
+        ghosts = [([], []) for _ in self.shards]
+        for index, (left_prey, left_food, right_prey, right_food) in enumerate(halos):
+            left, right = self.neighbours(index)
+            if left is not None:
+                ghosts[left][0].extend(left_prey)
+                ghosts[left][1].extend(left_food)
+            if right is not None:
+                ghosts[right][0].extend(right_prey)
+                ghosts[right][1].extend(right_food)
+        return ghosts
+
+    def step(self):
+        messages = [(prey, food, delivery['preys'], delivery['predators'], delivery['resources'],
+                     delivery['born_predators']) for (prey, food), delivery in zip(self.ghosts, self.incoming)]
+        if self.connections:
+            for connection, message in zip(self.connections, messages):
+                connection.send(message)
+            replies = [connection.recv() for connection in self.connections]
+        else:
+            replies = [shard.step(*message) for shard, message in zip(self.shards, messages)]
+
+        self.incoming = incoming = self.empty_deliveries()
+        for reply in replies:
+            for prey in reply['preys']:
+                incoming[self.owner(prey.x)]['preys'].append(prey)
+            for predator in reply['predators']:
+                incoming[self.owner(predator.x)]['predators'].append(predator)
+        self.ghosts = self.route_halos([reply['halos'] for reply in replies])
+        self.summaries = [reply['summary'] for reply in replies]
+        self.apply_world_rules()
+
+    def apply_world_rules(self):
+        """Predator respawn and new food patches, as at the end of Simulation.step"""
+        world, spawning, parameters = self.world, self.random.spawning, self.parameters
+        if self.count('predator_count') == 0:
+            if self.predator_extinction_tick is None:
+                self.predator_extinction_tick = self.tick_count
+                if self.verbose:
+                    print(f"  Predators went extinct at tick {self.tick_count}")
+            if self.tick_count - self.predator_extinction_tick >= 300:
+                if self.verbose:
+                    print(f"  Respawning 3 predators at tick {self.tick_count}")
+                for i in range(3):
+                    predator = ecosystem.Predator(spawning.randint(50, world.width-50),
+                                                  spawning.randint(50, world.height-50), parameters)
+                    self.incoming[self.owner(predator.x)]['born_predators'].append(predator)
+                self.predator_extinction_tick = None
+        else:
+            self.predator_extinction_tick = None
+
+        self.tick_count += 1
+        if self.tick_count % 25 == 0 and self.count('resource_count') < self.max_resources:
+            resource = ecosystem.Resource(spawning.randint(20, world.width-20), spawning.randint(20, world.height-20),
+                                          self.random.regrowth, parameters)
+            self.incoming[self.owner(resource.x)]['resources'].append(resource)
+
+    def count(self, name):
+        """World-wide total of a shard summary field, including agents still being delivered"""
+        total = sum(summary[name] for summary in self.summaries)
+        if name == 'predator_count':
+            total += sum(len(delivery['predators']) + len(delivery['born_predators']) for delivery in self.incoming)
+        elif name == 'prey_count':
+            total += sum(len(delivery['preys']) for delivery in self.incoming)
+        elif name in ('resource_count', 'food_count'):
+            total += sum(len(delivery['resources']) for delivery in self.incoming)
+        return total
+
+    def is_active(self):
+        return bool(self.count('prey_count') or self.count('predator_count'))
+
+    def sample(self, parameters_changed):
+        """Collect one row of run data for the whole world, like Simulation.sample"""
+        prey_count = self.count('prey_count')
+        learning_total = sum(summary['learning_total'] for summary in self.summaries)
+        learning_total += sum(prey.learning_level for delivery in self.incoming for prey in delivery['preys'])
+        eaten = sum(summary['total_prey_eaten'] for summary in self.summaries)
+        eaten += sum(predator.prey_eaten for delivery in self.incoming for predator in delivery['predators'])
+        extinction_tick = self.predator_extinction_tick
+        return {
+            'tick': self.tick_count,
+            'prey_count': prey_count,
+            'predator_count': self.count('predator_count'),
+            'resource_count': self.count('food_count'),
+            'avg_learning': round(max(0.0, learning_total / prey_count) if prey_count else 0, 3),
+            'total_prey_eaten': eaten,
+            'predators_respawned': 1 if extinction_tick and self.tick_count - extinction_tick >= 300 else 0,
+            'parameters_changed': parameters_changed
+        }
+
+    def close(self):
+        for connection in self.connections:
+            connection.send(None)
+            connection.close()
+        for worker in self.workers:
+            worker.join()
+        self.connections = []
+        self.workers = []
+
+
+def scaled_counts(width, height):
+    """Baseline populations scaled to the world's area, so densities match the 800x600 baseline"""
+    area = width * height / (ecosystem.screen_width * ecosystem.screen_height)
+    return tuple(max(1, round(count * area)) for count in (50, 10, 400, 600))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run one large world split into shards across cores")
+    parser.add_argument("--width", type=int, default=3200)
+    parser.add_argument("--height", type=int, default=2400)
+    parser.add_argument("--wrap", action="store_true", help="toroidal world: opposite edges join")
+    parser.add_argument("--shards", type=int, default=0, help="strips / worker processes (default: all cores)")
+    parser.add_argument("--counts", type=int, nargs=4, default=None,
+                        metavar=("PREY", "PREDATORS", "RESOURCES", "MAX_RESOURCES"),
+                        help="initial populations (default: the baseline densities scaled to the world)")
+    parser.add_argument("--max-ticks", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--in-process", action="store_true", help="step the shards one after another here")
+    parser.add_argument("--output", default="sharded_run.csv")
+    args = parser.parse_args()
+    try:
+        World(args.width, args.height, args.wrap)
+    except ValueError as error:
+        parser.error(str(error))
+
+    counts = args.counts or scaled_counts(args.width, args.height)
+    sim = ShardedSimulation(*counts, Parameters(), seed=args.seed, width=args.width, height=args.height,
+                            wrap=args.wrap, shards=args.shards or None, processes=not args.in_process)
+    parameters_changed = ecosystem.world_changed(Scenario(0, "Sharded world", *counts).parameters_changed(),
+                                                 sim.world)
+    print(f"{args.width}x{args.height}{' torus' if args.wrap else ''}, {len(sim.shards)} shards, "
+          f"counts {counts}, seed {sim.seed}")
+    start = time.perf_counter()
+    try:
+        with CSVSink(args.output, metadata_columns=RUN_CSV_COLUMNS) as sink:
+            sink.start_run({'run_number': 0, 'description': "Sharded world", 'seed': sim.seed,
+                            'parameters_changed': parameters_changed, **ecosystem.world_metadata(sim.world)})
+            ecosystem.run_loop(sim, args.max_ticks, parameters_changed, sink=sink)
+    finally:
+        sim.close()
+    elapsed = time.perf_counter() - start
+    sample = sim.sample(parameters_changed)
+    print(f"{sim.tick_count} ticks in {elapsed:.1f} s ({sim.tick_count / elapsed:.1f} ticks/s): "
+          f"{sample['prey_count']} prey, {sample['predator_count']} predators")
+    print(f"Data saved to {args.output}")
@@ -0,0 +1,220 @@
+import math
+
+# Prey and predators spawn at least 50 from every edge, so a world must leave room for that
+MIN_WORLD_SIZE = 100
+
+# Smallest grid cell: a query radius (vision) of 0 is allowed and simply finds nothing
+MIN_CELL_SIZE = 1.0
+
+
+class World:
+    """Size of the world and what happens at its edges
+
+    A bounded world keeps agents a margin away from its edges. A toroidal
+    world (wrap=True) joins opposite edges: positions wrap around and
+    offsets and distances are measured the short way round.
+    """
+    def __init__(self, width, height, wrap=False):
+        if width < MIN_WORLD_SIZE or height < MIN_WORLD_SIZE:
+            raise ValueError(f"The world must be at least {MIN_WORLD_SIZE}x{MIN_WORLD_SIZE}, got {width}x{height}")
+        self.width = width
+        self.height = height
+        self.wrap = wrap
+
+    def clamp(self, x, y, margin):
+        """Bring a position back into the world"""
+        if self.wrap:
+            return x % self.width, y % self.height
+        return max(margin, min(x, self.width - margin)), max(margin, min(y, self.height - margin))
+
+    def offset(self, x, y, to_x, to_y):
+        """(dx, dy) from one position to another"""
+        dx = to_x - x
+        dy = to_y - y
+        if self.wrap:
+            dx -= self.width * round(dx / self.width)
+            dy -= self.height * round(dy / self.height)
+        return dx, dy
+
+    def distance(self, x, y, to_x, to_y):
+        if self.wrap:
+            dx, dy = self.offset(x, y, to_x, to_y)
+            return math.sqrt(dx*dx + dy*dy)
+        return math.sqrt((x - to_x)**2 + (y - to_y)**2)
+
+    def grid(self, cell_size):
+        """Spatial index for this world"""
+        if self.wrap:
+            return TorusGrid(cell_size, self.width, self.height)
+        return SpatialGrid(cell_size)
+
+
+
+class SpatialGrid:
+    """Uniform grid that buckets agents by position for nearest-within-radius lookups
+
+    Items need x and y attributes and a serial number. Of two items at the
+    same distance the one with the lower serial wins, as in a scan of a
+    list kept in serial order. The grid is kept up to date
+    incrementally: insert() on birth / regrowth, remove() on death / eating,
+    and move() after an item changes position. A cell size close to the
+    query radius keeps each lookup to a handful of cells.
+    """
+    def __init__(self, cell_size):
+        self.cell_size = max(cell_size, MIN_CELL_SIZE)
+        self.cells = {}  # (cell_x, cell_y) -> {item: None}, dicts keep insertion order
+        self.item_cells = {}  # item -> (cell_x, cell_y)
+        # Operation counts, read by profiling.TickProfiler
+        self.distance_checks = 0
+        self.updates = 0
+
+    def __len__(self):
+        return len(self.item_cells)
+
+    def __contains__(self, item):
+        return item in self.item_cells
+
+    def __iter__(self):
+        return iter(self.item_cells)
+
+    def cell_of(self, x, y):
+        return (int(x // self.cell_size), int(y // self.cell_size))
+
+    def insert(self, item):
+        key = self.cell_of(item.x, item.y)
+        self.cells.setdefault(key, {})[item] = None
+        self.item_cells[item] = key
+        self.updates += 1
+
+    def remove(self, item):
+        key = self.item_cells.pop(item)
+        cell = self.cells[key]
+        del cell[item]
+        if not cell:
+            del self.cells[key]
+        self.updates += 1
+
+    def discard(self, item):
+        if item in self.item_cells:
+            self.remove(item)
+
+    def move(self, item):
+        """Re-bucket an item after its x/y changed"""
+        old_key = self.item_cells[item]
+        new_key = self.cell_of(item.x, item.y)
+        self.updates += 1
+        if new_key != old_key:
+            cell = self.cells[old_key]
+            del cell[item]
+            if not cell:
+                del self.cells[old_key]
+            self.cells.setdefault(new_key, {})[item] = None
+            self.item_cells[item] = new_key
+
+    def nearest(self, x, y, radius):
+        """Return (item, distance) of the closest item strictly inside radius, or (None, None)"""
+        cell_size = self.cell_size
+        cells = self.cells
+        center_x, center_y = self.cell_of(x, y)
+        reach = int(radius // cell_size) + 1
+
+        closest = None
+        closest_distance = radius
+        checks = 0
+        for ring in range(reach + 1):
+            # Every cell in this ring is at least (ring - 1) cells away from the query point
+            if closest is not None and (ring - 1) * cell_size > closest_distance:
+                break
+            for key in ring_cells(center_x, center_y, ring):
+                cell = cells.get(key)
+                if not cell:
+                    continue
+                checks += len(cell)
+                for item in cell:
+                    distance = math.sqrt((x - item.x)**2 + (y - item.y)**2)
+                    if distance < closest_distance or (distance == closest_distance and closest is not None
+                                                       and item.serial < closest.serial):
+                        closest_distance = distance
+                        closest = item
+        self.distance_checks += checks
+
+        if closest is None:
+            return None, None
+        return closest, closest_distance
+
+
+def ring_cells(center_x, center_y, ring):
+    """Cell keys on the square ring at Chebyshev distance ring from the center cell"""
+    if ring == 0:
+        yield (center_x, center_y)
+        return
+    for dx in range(-ring, ring + 1):
+        yield (center_x + dx, center_y - ring)
+        yield (center_x + dx, center_y + ring)
+    for dy in range(-ring + 1, ring):
+        yield (center_x - ring, center_y + dy)
+        yield (center_x + ring, center_y + dy)
+
+
+class TorusGrid(SpatialGrid):
+    """SpatialGrid for a toroidal world: cells wrap around the edges
+
+    The world is cut into whole cells (at least cell_size on a side), so
+    the cells across an edge are ordinary neighbours, and distances are
+    measured the short way round.
+    """
+    def __init__(self, cell_size, width, height):
+        cell_size = max(cell_size, MIN_CELL_SIZE)
+        self.columns = max(1, int(width // cell_size))
+        self.rows = max(1, int(height // cell_size))
+        self.cell_width = width / self.columns
+        self.cell_height = height / self.rows
+        # The smaller side bounds how far away a ring of cells can be
+        super().__init__(min(self.cell_width, self.cell_height))
+        self.width = width
+        self.height = height
+
+    def cell_of(self, x, y):
+        return (int(x // self.cell_width) % self.columns, int(y // self.cell_height) % self.rows)
+
+    def nearest(self, x, y, radius):
+        cell_size = self.cell_size
+        cells = self.cells
+        columns, rows = self.columns, self.rows
+        width, height = self.width, self.height
+        center_x, center_y = self.cell_of(x, y)
+        reach = min(int(radius // cell_size) + 1, max(columns, rows) // 2 + 1)
+        # Large rings wrap onto cells already visited
+        seen = set() if 2 * reach + 1 > min(columns, rows) else None
+
+        closest = None
+        closest_distance = radius
+        checks = 0
+        for ring in range(reach + 1):
+            if closest is not None and (ring - 1) * cell_size > closest_distance:
+                break
+            for cell_x, cell_y in ring_cells(center_x, center_y, ring):
+                key = (cell_x % columns, cell_y % rows)
+                if seen is not None:
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                cell = cells.get(key)
+                if not cell:
+                    continue
+                checks += len(cell)
+                for item in cell:
+                    dx = abs(x - item.x)
+                    dy = abs(y - item.y)
+                    dx = min(dx, width - dx)
+                    dy = min(dy, height - dy)
+                    distance = math.sqrt(dx*dx + dy*dy)
+                    if distance < closest_distance or (distance == closest_distance and closest is not None
+                                                       and item.serial < closest.serial):
+                        closest_distance = distance
+                        closest = item
+        self.distance_checks += checks
+
+        if closest is None:
+            return None, None
+        return closest, closest_distance
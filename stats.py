@@ -0,0 +1,219 @@
+"""Running population statistics, updated in O(1) per simulation event
+
+Simulation reports births, deaths, kills, eating, regrowth and every agent
+update to a PopulationStats object, so counts, means and totals can be read
+at any tick without rescanning the populations. The learning total goes
+into the run samples, so it is kept with compensated summation and
+recounted exactly whenever a sample is taken.
+"""
+import math
+
+
+class RunningMoments:
+    """Count, mean and variance of a changing multiset of values
+
+    Values are stored shifted by a constant close to their typical value,
+    which keeps the sum-of-squares variance numerically stable. min/max are
+    folded in with observe() during the engine's update pass (values that
+    leave the set afterwards are not retracted until the next pass).
+    """
+    def __init__(self, shift=0.0):
+        self.shift = shift
+        self.count = 0
+        self.total = 0.0
+        self.total_squares = 0.0
+        self.begin_pass()
+
+    def add(self, value):
+        value -= self.shift
+        self.count += 1
+        self.total += value
+        self.total_squares += value * value
+
+    def remove(self, value):
+        value -= self.shift
+        self.count -= 1
+        if self.count == 0:
+            # Start again from exact zeros so rounding drift cannot build up
+            self.total = 0.0
+            self.total_squares = 0.0
+        else:
+            self.total -= value
+            self.total_squares -= value * value
+
+    def replace(self, old_value, new_value):
+        old_value -= self.shift
+        new_value -= self.shift
+        self.total += new_value - old_value
+        self.total_squares += new_value * new_value - old_value * old_value
+
+    def begin_pass(self):
+        self.min = math.inf
+        self.max = -math.inf
+
+    def observe(self, value):
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self):
+        return self.shift + self.total / self.count if self.count else 0.0
+
+    @property
+    def variance(self):
+        """Population variance"""
+        if not self.count:
+            return 0.0
+        mean = self.total / self.count
+        return max(0.0, self.total_squares / self.count - mean * mean)
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+
+class PopulationStats:
+    """Aggregates over the live prey, predators and food patches of one run"""
+    def __init__(self):
+        self.prey_energy = RunningMoments(shift=150)  # Prey start with 150 energy
+        self.predator_energy = RunningMoments(shift=120)  # Predators start with 120
+        self.learning_sum = 0.0  # Neumaier sum of the prey learning levels
+        self.learning_compensation = 0.0
+        self.resource_count = 0  # All patches
+        self.food_count = 0  # Patches that currently have food
+        self.total_prey_eaten = 0  # Prey eaten by the predators alive now
+
+        # Cumulative event counters
+        self.prey_births = 0
+        self.prey_deaths = 0  # Starvation
+        self.prey_killed = 0
+        self.predator_births = 0
+        self.predator_deaths = 0
+        self.food_eaten = 0
+        self.food_regrown = 0
+
+    @property
+    def prey_count(self):
+        return self.prey_energy.count
+
+    @property
+    def predator_count(self):
+        return self.predator_energy.count
+
+    @property
+    def learning_total(self):
+        return self.learning_sum + self.learning_compensation
+
+    @property
+    def avg_learning(self):
+        # Learning levels are never negative; rounding must not make the mean -0.0
+        return max(0.0, self.learning_total / self.prey_count) if self.prey_count else 0
+
+    def add_learning(self, value):
+        total = self.learning_sum + value
+        if abs(self.learning_sum) >= abs(value):
+            self.learning_compensation += (self.learning_sum - total) + value
+        else:
+            self.learning_compensation += (value - total) + self.learning_sum
+        self.learning_sum = total
+
+    def recount_learning(self, preys):
+        """Replace the running learning total by an exact sum over preys"""
+        self.learning_sum = sum(prey.learning_level for prey in preys)
+        self.learning_compensation = 0.0
+
+    # Prey events
+    def prey_born(self, prey):
+        self.prey_births += 1
+        self.prey_added(prey)
+
+    def prey_added(self, prey):
+        """A prey joins the population (born, or moved in from another shard)"""
+        self.prey_energy.add(prey.energy)
+        self.prey_energy.observe(prey.energy)
+        self.add_learning(prey.learning_level)
+
+    def prey_updated(self, prey, old_energy, old_learning):
+        self.prey_energy.replace(old_energy, prey.energy)
+        if prey.learning_level != old_learning:
+            self.add_learning(prey.learning_level)
+            self.add_learning(-old_learning)
+
+    def prey_died(self, prey, killed=False):
+        if killed:
+            self.prey_killed += 1
+            self.total_prey_eaten += 1
+        else:
+            self.prey_deaths += 1
+        self.prey_removed(prey)
+
+    def prey_removed(self, prey):
+        self.prey_energy.remove(prey.energy)
+        if self.prey_energy.count:
+            self.add_learning(-prey.learning_level)
+        else:
+            self.learning_sum = 0.0
+            self.learning_compensation = 0.0
+
+    # Predator events
+    def predator_born(self, predator):
+        self.predator_births += 1
+        self.predator_added(predator)
+
+    def predator_added(self, predator):
+        self.predator_energy.add(predator.energy)
+        self.predator_energy.observe(predator.energy)
+        self.total_prey_eaten += predator.prey_eaten
+
+    def predator_updated(self, predator, old_energy):
+        self.predator_energy.replace(old_energy, predator.energy)
+
+    def predator_died(self, predator):
+        self.predator_deaths += 1
+        self.predator_removed(predator)
+
+    def predator_removed(self, predator):
+        self.predator_energy.remove(predator.energy)
+        self.total_prey_eaten -= predator.prey_eaten
+
+    # Food events
+    def resource_added(self, resource):
+        self.resource_count += 1
+        if resource.has_food:
+            self.food_count += 1
+
+    def food_was_eaten(self):
+        self.food_eaten += 1
+        self.food_count -= 1
+
+    def food_has_regrown(self):
+        self.food_regrown += 1
+        self.food_count += 1
+
+    def summary(self):
+        """All current aggregates as a flat dict"""
+        return {
+            'prey_count': self.prey_count,
+            'predator_count': self.predator_count,
+            'food_count': self.food_count,
+            'resource_count': self.resource_count,
+            'avg_learning': self.avg_learning,
+            'total_prey_eaten': self.total_prey_eaten,
+            'prey_energy_mean': self.prey_energy.mean,
+            'prey_energy_std': self.prey_energy.std,
+            'prey_energy_min': self.prey_energy.min,
+            'prey_energy_max': self.prey_energy.max,
+            'predator_energy_mean': self.predator_energy.mean,
+            'predator_energy_std': self.predator_energy.std,
+            'predator_energy_min': self.predator_energy.min,
+            'predator_energy_max': self.predator_energy.max,
+            'prey_births': self.prey_births,
+            'prey_deaths': self.prey_deaths,
+            'prey_killed': self.prey_killed,
+            'predator_births': self.predator_births,
+            'predator_deaths': self.predator_deaths,
+            'food_eaten': self.food_eaten,
+            'food_regrown': self.food_regrown,
+        }
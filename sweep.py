@@ -0,0 +1,138 @@
+"""Run the scenarios and their replicate seeds across a process pool
+
+Each job is one (scenario, replicate) pair. The scenario's rules travel
+with the job as a config.Parameters, so any worker can run any scenario.
+All samples go to one combined CSV or columnar dataset (see metrics.py),
+written as each run finishes. Replicate 0 of a scenario uses the same
+seed as run_all_simulations(seed=...), so both produce identical samples.
+
+    python sweep.py --replicates 8 --workers 4 --output sweep_results.csv
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import ecosystem
+from ecosystem import SCENARIOS, run_seed
+from metrics import CSVSink, ColumnarSink, SWEEP_CSV_COLUMNS
+
+
+def make_jobs(scenarios=SCENARIOS, replicates=1, base_seed=0, max_ticks=1000, engine="object"):
+    jobs = []
+    for scenario in scenarios:
+        for replicate in range(replicates):
+            jobs.append({
+                'run_number': scenario.run_number,
+                'description': scenario.description,
+                'replicate': replicate,
+                'seed': run_seed(base_seed, scenario.run_number, replicate),
+                'scenario': scenario,
+                'max_ticks': max_ticks,
+                'engine': engine,
+            })
+    return jobs
+
+
+def run_job(job):
+    """Run one scenario replicate headless and return its samples (runs inside a worker)"""
+    scenario = job['scenario']
+    if job['engine'] == "array":
+        from array_engine import ArrayEcosystem
+        sim = ArrayEcosystem(*scenario.counts, scenario.parameters, seed=job['seed'])
+    else:
+        sim = ecosystem.Simulation(*scenario.counts, scenario.parameters, seed=job['seed'], verbose=False)
+    parameters_changed = ecosystem.world_changed(scenario.parameters_changed(), sim.world)
+
+    start = time.perf_counter()
+    run_data = ecosystem.run_loop(sim, job['max_ticks'], parameters_changed)
+    sample = sim.sample(parameters_changed)
+    return {
+        'job': job,
+        'parameters_changed': parameters_changed,
+        'world': ecosystem.world_metadata(sim.world),
+        'run_data': run_data,
+        'final_prey': sample['prey_count'],
+        'final_predators': sample['predator_count'],
+        'final_tick': sim.tick_count,
+        'elapsed': time.perf_counter() - start,
+    }
+
+
+def write_result(sink, result):
+    job = result['job']
+    sink.start_run({
+        'run_number': job['run_number'],
+        'description': job['description'],
+        'replicate': job['replicate'],
+        'seed': job['seed'],
+        'engine': job['engine'],
+        'parameters_changed': result['parameters_changed'],
+        'parameters': job['scenario'].parameters.changes(),
+        **result['world'],
+    })
+    for data_point in result['run_data']:
+        sink.write(data_point)
+    sink.flush()
+
+
+def run_sweep(scenarios=SCENARIOS, replicates=1, base_seed=0, max_ticks=1000, engine="object",
+              workers=None, output="sweep_results.csv", output_format="csv"):
+    """Run every scenario replicate on a pool of workers and write one combined output
+    
+    output is a CSV file, or a columnar dataset directory (appended to if it
+    exists) with output_format="columnar". Each run is written as soon as it
+    finishes, so an interrupted sweep keeps the runs already done.
+    Returns one summary per run; the samples themselves are only in output.
+    """
+    jobs = make_jobs(scenarios, replicates, base_seed, max_ticks, engine)
+    workers = workers or os.cpu_count() or 1
+    if output_format == "columnar":
+        sink = ColumnarSink(output)
+    else:
+        sink = CSVSink(output, metadata_columns=SWEEP_CSV_COLUMNS)
+
+    start = time.perf_counter()
+    results = []
+    with sink:
+        if workers == 1:
+            for job in jobs:
+                result = run_job(job)
+                write_result(sink, result)
+                del result['run_data']  # Already in the sink; keep memory flat over long sweeps
+                results.append(result)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for result in pool.map(run_job, jobs, chunksize=1):
+                    write_result(sink, result)
+                    del result['run_data']
+                    results.append(result)
+    elapsed = time.perf_counter() - start
+
+    busy = sum(result['elapsed'] for result in results)
+    print(f"{len(jobs)} runs on {workers} workers in {elapsed:.1f} s (summed run time {busy:.1f} s)")
+    for result in results:
+        job = result['job']
+        status = "STABLE" if result['final_prey'] > 0 and result['final_predators'] > 0 else "EXTINCT"
+        print(f"Run {job['run_number']:02d}.{job['replicate']} ({job['description']}): "
+              f"{result['final_prey']} prey, {result['final_predators']} predators "
+              f"at tick {result['final_tick']} - {status}")
+    print(f"Data saved to {output}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the ecosystem scenarios in parallel")
+    parser.add_argument("--replicates", type=int, default=1, help="seeds per scenario")
+    parser.add_argument("--seed", type=int, default=0, help="base seed for the replicate seeds")
+    parser.add_argument("--max-ticks", type=int, default=1000)
+    parser.add_argument("--engine", choices=["object", "array"], default="object")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (default: all cores)")
+    parser.add_argument("--format", choices=["csv", "columnar"], default="csv",
+                        help="combined CSV file or columnar dataset directory")
+    parser.add_argument("--output", default=None,
+                        help="output path (default: sweep_results.csv or sweep_dataset/)")
+    args = parser.parse_args()
+    output = args.output or ("sweep_dataset" if args.format == "columnar" else "sweep_results.csv")
+    run_sweep(replicates=args.replicates, base_seed=args.seed, max_ticks=args.max_ticks,
+              engine=args.engine, workers=args.workers, output=output, output_format=args.format)